@@ -0,0 +1,11 @@
+"""
+Behaviour pipeline shared by every home folder.
+
+Each stage module has main(profile, argv=None, home_dir=None): profile is a
+home folder name (see profiles.PROFILES) or a HomeProfile, and home_dir is
+the folder holding downloads/ and analyzed/, by default python/<home>.
+"""
+from .profiles import PROFILES, HomeProfile, get_profile
+
+# daily stages, in the order run_script runs them
+STAGE_NAMES = ("getExcelInfo", "getPdfInfo", "getBe", "update", "upload_to_dashboard")
@@ -0,0 +1,5 @@
+#python3 -m engine [--home oneill ...] [--daemon] runs the daily scripts for the given homes (default: all)
+from .run_script import main
+
+if __name__ == "__main__":
+    main()
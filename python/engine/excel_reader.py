@@ -0,0 +1,85 @@
+#reads the incident report workbooks (only the columns getExcelInfo uses) and keeps a parquet copy so each .xls is parsed once
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+
+import pandas as pd
+
+from .manifest import hash_file
+
+# shared by every home: parsed reports are keyed by the workbook's hash and the columns read from it
+CACHE_DIR = os.getenv("EXCEL_CACHE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "excel"))
+EXCEL_CACHE_ENABLED = os.getenv("EXCEL_CACHE_ENABLED", "1") == "1"
+# "auto" uses calamine when python-calamine is installed, otherwise pandas' default (xlrd for .xls)
+EXCEL_READER_ENGINE = os.getenv("EXCEL_READER_ENGINE", "auto")
+
+# bump when the columns read or their parsing change, so old cached copies are not reused
+CACHE_VERSION = 1
+
+GROUP_ROW = 6   # group headers (Injury Noted - During, Predisposing Factors ...), only over the first column of each group
+HEADER_ROW = 7  # column names
+REPORT_COLUMNS = (
+    'Incident #', 'Incident Type', 'Resident Name', 'Incident Date/Time',
+    'Incident Location', 'Incident Status', 'Resident Room Number',
+)
+
+def reader_engine():
+    if EXCEL_READER_ENGINE != "auto":
+        return EXCEL_READER_ENGINE or None
+    return "calamine" if importlib.util.find_spec("python_calamine") else None
+
+def cache_enabled() -> bool:
+    """Parquet needs pyarrow; without it every run reads the workbook."""
+    return EXCEL_CACHE_ENABLED and importlib.util.find_spec("pyarrow") is not None
+
+def injury_positions(column_groups, injury_groups):
+    """
+    Positions of the injury Y/N columns: those under one of the injury_groups headers.
+    A group header is only in its first column, so it is carried forward until the next one.
+    """
+    return [position for position, group in enumerate(column_groups.ffill()) if group in injury_groups]
+
+def parse_report(input_file, injury_groups):
+    """Read the report columns and the injury columns of a workbook, skipping every other column."""
+    with pd.ExcelFile(input_file, engine=reader_engine()) as workbook:
+        header_rows = workbook.parse(header=None, skiprows=GROUP_ROW, nrows=HEADER_ROW - GROUP_ROW + 1)
+        column_groups, column_names = header_rows.iloc[0], header_rows.iloc[-1]
+        positions = [position for position, name in enumerate(column_names) if name in REPORT_COLUMNS]
+        positions += injury_positions(column_groups, injury_groups)
+        return workbook.parse(header=HEADER_ROW, usecols=sorted(set(positions)))
+
+def read_incident_report(input_file, injury_groups):
+    """
+    The incident rows of a report workbook and the names of its injury columns.
+
+    A parquet copy is kept under cache/excel/ keyed by the file hash, so
+    re-runs and backfills of a day that was already read skip the workbook.
+    """
+    df = None
+    cache_file = None
+    if cache_enabled():
+        key = hashlib.sha256(json.dumps([CACHE_VERSION, list(injury_groups)]).encode()).hexdigest()[:16]
+        cache_file = os.path.join(CACHE_DIR, f"{hash_file(input_file)}_{key}.parquet")
+        if os.path.exists(cache_file):
+            try:
+                df = pd.read_parquet(cache_file)
+                logging.info(f"Excel cache hit for {input_file}")
+            except Exception as e:
+                logging.warning(f"Could not read cached copy of {input_file}, reading the workbook: {e}")
+
+    if df is None:
+        df = parse_report(input_file, injury_groups)
+        if cache_file:
+            try:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                # written next to the final name first, so parallel homes never read half a file
+                partial_file = f"{cache_file}.{os.getpid()}.partial"
+                df.to_parquet(partial_file, index=False)
+                os.replace(partial_file, cache_file)
+            except Exception as e:
+                logging.warning(f"Could not cache {input_file}: {e}")
+
+    injury_cols = [column for column in df.columns if column not in REPORT_COLUMNS]
+    return df, injury_cols
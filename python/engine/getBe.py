@@ -0,0 +1,925 @@
+import argparse
+import asyncio
+import pandas as pd
+from datetime import datetime, timedelta
+import re
+import os
+from bisect import bisect_left, bisect_right
+from .homes_db import homes_dict
+from .llm_client import get_llm_client, log_cache_stats
+from .manifest import Manifest, add_manifest_arguments
+from .profiles import NO_PROGRESS_NOTE, HomeProfile, get_profile
+from dotenv import load_dotenv
+
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '../../.env'))
+
+async def get_poa_contact_status(text):
+    """
+    Use OpenAI API to determine if POA was contacted based on text description.
+    
+    Parameters:
+    text (str): Text describing POA contact
+    
+    Returns:
+    str: 'yes' or 'no'
+    """
+
+    text = str(text).lower().strip()
+    yes_keywords = ['yes', 'notified']
+    if any(keyword in text for keyword in yes_keywords):
+        print("poa YES found, not sending to api")
+        return 'yes'
+    else:
+        print("no YES found, sending to API")
+        try:
+            prompt = f"""Based on the following text, determine if the POA (Power of Attorney) was contacted.
+    Text: {text}
+
+    Answer only with 'yes' or 'no'. If unclear or not mentioned, answer 'no'."""
+
+            content = await get_llm_client().complete(
+                "poa_status:v1",
+                model="gpt-3.5-turbo",
+                messages=[
+                    {"role": "system", "content": "You are a healthcare analyst determining if POA was contacted. Answer only with 'yes' or 'no'."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.3,
+                max_tokens=10
+            )
+            
+            result = content.strip().lower()
+            
+            return 'yes' if result == 'yes' else 'no'
+        
+        except Exception as e:
+            print(f"Error getting POA contact status from OpenAI: {str(e)}")
+            return 'no'
+
+async def get_poa_contact_status_batch(texts):
+    """
+    get_poa_contact_status for many texts: keyword matches answer 'yes' straight away,
+    the rest go to the model several per request (see LLMClient.complete_batch) and
+    fall back to single calls when the batch could not answer them.
+    """
+    texts = [str(text).lower().strip() for text in texts]
+    yes_keywords = ['yes', 'notified']
+    unclear = [text for text in texts if not any(keyword in text for keyword in yes_keywords)]
+    answers = await get_llm_client().complete_batch(
+        "poa_status:v1",
+        "For each text, determine if the POA (Power of Attorney) was contacted. "
+        "Answer each text only with 'yes' or 'no'. If unclear or not mentioned, answer 'no'.",
+        unclear,
+        system="You are a healthcare analyst determining if POA was contacted. Answer only with 'yes' or 'no'.",
+        answer_tokens=5
+    )
+    unclear_answers = dict(zip(unclear, answers))
+
+    async def resolve(text):
+        if text not in unclear_answers:
+            return 'yes'
+        answer = unclear_answers[text]
+        if answer is None:
+            return await get_poa_contact_status(text)
+        return 'yes' if answer.lower() == 'yes' else 'no'
+
+    return list(await asyncio.gather(*[resolve(text) for text in texts]))
+    
+async def get_behaviour_summary(data, openai_api_key):
+    """Extracts the text between 'Describe the behaviour :' and 'Disruptiveness (Data)/Consequences to the behaviour :' and summarizes it using ChatGPT."""
+    data = str(data)
+    match = re.search(r"Describe the behaviour :(.*?)(Disruptiveness \(Data\)/Consequences to the behaviour :|$)", data, re.DOTALL)
+    behaviour_text = match.group(1).strip() if match else ''
+    if not behaviour_text:
+        return ''
+    prompt = f"Summarize the following behaviour description in 1-2 sentences:\n{behaviour_text}"
+    try:
+        content = await get_llm_client(openai_api_key).complete(
+            "behaviour_summary:v1",
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": "You are a healthcare analyst summarizing behaviour incidents."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3,
+            max_tokens=60
+        )
+        summary = content.strip()
+        return summary
+    except Exception as e:
+        print(f"Error getting behaviour summary from OpenAI: {str(e)}")
+        return ''
+
+class EpisodeIndex:
+    """
+    Per-resident episodes of the notes: an incident and the same resident's
+    notes after it, up to their next 'Incident - Falls'. The notes are newest
+    first, so an episode is the rows above the incident.
+
+    Built in one pass; each lookup is a bisect and a slice instead of a scan
+    back through the whole file.
+    """
+
+    def __init__(self, df_notes):
+        self.df_notes = df_notes
+        self.positions = {}       # resident -> row positions, ascending
+        self.episode_starts = {}  # resident -> for each rank, rank just after the last incident before it
+        last_incident = {}
+        for position, (name, note_type) in enumerate(zip(df_notes['Resident Name'], df_notes['Type'])):
+            if pd.isna(name):
+                continue
+            positions = self.positions.setdefault(name, [])
+            self.episode_starts.setdefault(name, []).append(last_incident.get(name, 0))
+            positions.append(position)
+            if note_type == 'Incident - Falls':
+                last_incident[name] = len(positions)
+        for name, starts in self.episode_starts.items():
+            starts.append(last_incident.get(name, 0))
+
+    def episode(self, incident_index, resident_name=None):
+        """
+        The resident's notes between incident_index and their next incident,
+        nearest first (the order the old backward scans visited them).
+        """
+        if resident_name is None:
+            resident_name = self.df_notes.iloc[incident_index]['Resident Name']
+        positions = self.positions.get(resident_name)
+        if not positions:
+            return self.df_notes.iloc[0:0]
+        rank = bisect_left(positions, incident_index)
+        return self.df_notes.iloc[positions[self.episode_starts[resident_name][rank]:rank][::-1]]
+
+    def notes(self, incident_index, resident_name=None, note_type='Post Fall - Nursing'):
+        episode = self.episode(incident_index, resident_name)
+        return episode[episode['Type'] == note_type]
+
+async def check_poa_contact(df_notes, incident_index, resident_name, initial_poa_status, episodes: EpisodeIndex = None):
+    """
+    Check for POA contact in incident note and associated post-fall notes.
+    Returns updated POA contact status.
+    """
+    current_status = initial_poa_status
+    poa_sentences = []
+    episodes = episodes or EpisodeIndex(df_notes)
+    
+    # Check post-fall notes
+    for data in episodes.notes(incident_index, resident_name)['Data']:
+        note_text = str(data).lower()
+        
+        # Look for sentences containing "poa"
+        sentences = note_text.split('.')
+        poa_sentences.extend(sentence for sentence in sentences if 'poa' in sentence)
+    
+    # Ask about all of the sentences together instead of one request each
+    if 'yes' in await get_poa_contact_status_batch(poa_sentences):
+        return 'yes'
+    
+    return current_status
+
+def clean_name(name):
+    """Clean and standardize resident name format."""
+    if pd.isna(name):
+        return ''
+    name = str(name).strip()
+    if ',' in name:
+        last, first = name.split(',', 1)
+        return f"{last.strip()}, {first.strip()}"
+    return name
+
+async def gpt_determine_who_affected(row, openai_api_key):
+    """
+    Use OpenAI API to determine who was affected by the incident based on the incident's information.
+    Returns a comma-separated list of any of: Resident Initiated, Resident Received, Staff Received.
+    """
+    prompt = f"""
+    Based on the following incident information, classify who was affected. Choose ALL that apply from the following categories and answer with a comma-separated list:
+    - Resident Initiated
+    - Resident Received
+    - Staff Received
+
+    Incident Type: {row.get('incident_type', '')}
+    Behaviour Type: {row.get('behaviour_type', '')}
+    Description: {row.get('description', '')}
+    Consequences: {row.get('consequences', '')}
+    Interventions: {row.get('interventions', '')}
+    
+    Answer with a comma-separated list of the categories above. If unclear, answer with the most likely categories.
+    """
+    try:
+        content = await get_llm_client(openai_api_key).complete(
+            "who_affected:v1",
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": "You are a healthcare analyst classifying who was affected in a behaviour incident. Answer with a comma-separated list of the four categories, choosing all that apply."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.0,
+            max_tokens=20
+        )
+        return parse_who_affected(content)
+    except Exception as e:
+        print(f"Error getting who_affected from OpenAI: {str(e)}")
+        return "Resident Initiated"
+
+def parse_who_affected(result):
+    """Keep only the known who_affected categories from a model answer."""
+    result = result.strip()
+    # Validate and clean result
+    valid_categories = [
+        "Resident Initiated",
+        "Resident Received",
+        "Staff Received",
+        "Staff Initiated"
+    ]
+    # Split and clean
+    selected = [cat.strip() for cat in result.split(',') if cat.strip() in valid_categories]
+    if selected:
+        return ', '.join(selected)
+    else:
+        return "Resident Initiated"  # Default fallback
+
+async def gpt_determine_who_affected_batch(rows, openai_api_key):
+    """
+    who_affected for many incidents, several per request (see LLMClient.complete_batch).
+    Incidents the batch could not answer fall back to gpt_determine_who_affected.
+    """
+    items = [
+        f"Incident Type: {row.get('incident_type', '')}\n"
+        f"Behaviour Type: {row.get('behaviour_type', '')}\n"
+        f"Description: {row.get('description', '')}\n"
+        f"Consequences: {row.get('consequences', '')}\n"
+        f"Interventions: {row.get('interventions', '')}"
+        for row in rows
+    ]
+    answers = await get_llm_client(openai_api_key).complete_batch(
+        "who_affected:v1",
+        "For each incident, classify who was affected. Choose ALL that apply from the following categories: "
+        "Resident Initiated, Resident Received, Staff Received. "
+        "Answer each incident with a comma-separated list of the categories. If unclear, answer with the most likely categories.",
+        items,
+        system="You are a healthcare analyst classifying who was affected in behaviour incidents.",
+        answer_tokens=20
+    )
+
+    async def resolve(row, answer):
+        if answer is None:
+            return await gpt_determine_who_affected(row, openai_api_key)
+        return parse_who_affected(answer)
+
+    return list(await asyncio.gather(*[resolve(row, answer) for row, answer in zip(rows, answers)]))
+
+def check_code_white(row):
+    """Check if 'code white' is mentioned in any of the text fields."""
+    # Fields to check for code white
+    fields_to_check = ['description', 'consequences', 'interventions', 'behaviour_type']
+    
+    for field in fields_to_check:
+        text = str(row.get(field, '')).lower()
+        if 'code white' in text.replace('-', ' ').replace('_', ' '):
+            return 'yes'
+    
+    return 'no'
+
+def check_prn(row):
+    """Check if 'PRN' is mentioned in any of the text fields."""
+    # Fields to check for PRN
+    fields_to_check = ['description', 'consequences', 'interventions', 'medication_changes', 'outcome']
+    
+    for field in fields_to_check:
+        text = str(row.get(field, '')).lower()
+        if 'prn' in text:
+            return 'yes'
+    
+    return 'no'
+
+class NoteFieldParser:
+    """
+    Reads all the labelled fields of one note format (profile.behaviour_fields) in one pass.
+
+    One regex scan finds every label and end marker in the note. A field runs
+    from the first occurrence of its label to the first of its end markers
+    after it (or the end of the note), and is NO_PROGRESS_NOTE when the label
+    is missing or the field is empty.
+    """
+
+    def __init__(self, fields):
+        self.fields = dict(fields)
+        tokens = {label for label, _ in self.fields.values()}
+        tokens.update(marker for _, end_markers in self.fields.values() for marker in end_markers)
+        # Longest first, so a match is the longest token starting there; the shorter
+        # tokens it starts with (e.g. "Interventions" in its label) are at the same position
+        tokens = sorted(tokens, key=len, reverse=True)
+        self.pattern = re.compile("(?=(" + "|".join(re.escape(token) for token in tokens) + "))")
+        self.prefixes = {token: [other for other in tokens if token.startswith(other)] for token in tokens}
+
+    def parse(self, text):
+        """Field key -> value for one note."""
+        text = str(text)
+        positions = {}
+        for match in self.pattern.finditer(text):
+            for token in self.prefixes[match.group(1)]:
+                positions.setdefault(token, []).append(match.start())
+
+        fields = {}
+        for key, (label, end_markers) in self.fields.items():
+            if label not in positions:
+                fields[key] = NO_PROGRESS_NOTE
+                continue
+            start = positions[label][0] + len(label)
+            end = len(text)
+            for marker in end_markers:
+                found = positions.get(marker, ())
+                next_marker = bisect_left(found, start)
+                if next_marker < len(found):
+                    end = min(end, found[next_marker])
+            fields[key] = text[start:end].strip() or NO_PROGRESS_NOTE
+        return fields
+
+    def parse_column(self, texts):
+        """parse over a whole Series of notes, as a DataFrame with one column per field."""
+        return pd.DataFrame([self.parse(text) for text in texts.tolist()], index=texts.index, columns=list(self.fields))
+
+_FIELD_PARSERS = {}
+
+def field_parser(profile: HomeProfile) -> NoteFieldParser:
+    """The NoteFieldParser for a profile's behaviour_fields, compiled once per note format."""
+    key = tuple(profile.behaviour_fields.items())
+    if key not in _FIELD_PARSERS:
+        _FIELD_PARSERS[key] = NoteFieldParser(profile.behaviour_fields)
+    return _FIELD_PARSERS[key]
+
+def check_hir_status(df_notes, incident_index, resident_name, episodes: EpisodeIndex = None):
+    """Check for HIR status in incident note and associated post-fall notes."""
+    hir_keywords = ['hir initiated', 'hir continued','head injury routine']
+    incident_note = df_notes.iloc[incident_index]['Data'].lower()
+    
+    if any(keyword in incident_note for keyword in hir_keywords):
+        return True
+    
+    episodes = episodes or EpisodeIndex(df_notes)
+    return any('hir' in str(data).lower() for data in episodes.notes(incident_index, resident_name)['Data'])
+
+def check_hospital_transfer(df_notes, incident_index, resident_name, episodes: EpisodeIndex = None):
+    """Check for hospital transfer keywords in incident note and associated post-fall notes."""
+    hospital_keywords = ['hospital', 'ambulance', '911']
+    incident_note = df_notes.iloc[incident_index]['Data'].lower()
+    
+    if any(keyword in incident_note for keyword in hospital_keywords):
+        return True
+    
+    episodes = episodes or EpisodeIndex(df_notes)
+    return any(
+        any(keyword in str(data).lower() for keyword in hospital_keywords)
+        for data in episodes.notes(incident_index, resident_name)['Data']
+    )
+
+def count_post_fall_notes(df_notes, incident_index, episodes: EpisodeIndex = None):
+    """Count post-fall notes starting from an incident until the next incident."""
+    episodes = episodes or EpisodeIndex(df_notes)
+    return len(episodes.notes(incident_index))
+
+def get_injuries_from_notes(df_notes, incident_index, resident_name, episodes: EpisodeIndex = None):
+    """
+    Get all unique injuries from incident note and subsequent post-fall notes until next incident.
+    Returns concatenated string of all unique injuries found.
+    """
+    unique_injuries = set()  # Use a set to track unique injuries
+    
+    if 'Injuries' not in df_notes.columns:
+        return "No Injury"
+    
+    # Injuries from the incident note, then from the post-fall notes until the next incident
+    episodes = episodes or EpisodeIndex(df_notes)
+    note_injuries = [df_notes.iloc[incident_index]['Injuries']]
+    note_injuries.extend(episodes.notes(incident_index, resident_name)['Injuries'])
+    for injuries in note_injuries:
+        if injuries and injuries != "No Injury":
+            # Split multiple injuries and add each one
+            for injury in injuries.lower().split(','):
+                unique_injuries.add(injury.strip())
+    
+    # Convert back to a sorted list and join with commas
+    if unique_injuries:
+        # Capitalize first letter of each injury
+        formatted_injuries = [injury.capitalize() for injury in sorted(unique_injuries)]
+        return ', '.join(formatted_injuries)
+    return "No Injury"
+
+def check_rnao_assessment(df_notes, incident_index, resident_name, episodes: EpisodeIndex = None):
+    """Check if an RNAO post fall assessment was completed after the fall incident."""
+    episodes = episodes or EpisodeIndex(df_notes)
+    return not episodes.notes(incident_index, resident_name, 'RNAO - Post Fall Assessment').empty
+
+BEHAVIOUR_NOTE_COLUMNS = ['name', 'datetime', 'date', 'time', 'behaviour_type', 'triggers',
+                          'description', 'consequences', 'interventions', 'medication_changes',
+                          'risks', 'outcome', 'poa_notified', 'injuries']
+
+def process_behaviour_notes(df_notes, profile: HomeProfile):
+    """
+    Process behaviour notes to extract required information.
+
+    The note types, the fields read from each note and how they fill the
+    incident columns all come from the home profile.
+    """
+    notes = df_notes[df_notes['Type'].isin(profile.behaviour_note_types)]
+    
+    # Ensure DataFrame has expected columns even when empty
+    if notes.empty:
+        extra_columns = [column for column in profile.behaviour_columns if column not in BEHAVIOUR_NOTE_COLUMNS]
+        return pd.DataFrame(columns=BEHAVIOUR_NOTE_COLUMNS + extra_columns)
+    
+    fields = field_parser(profile).parse_column(notes['Data'])
+    effective_dates = pd.to_datetime(notes['Effective Date'])
+    
+    incidents = pd.DataFrame({
+        'name': notes['Resident Name'].map(clean_name),
+        'datetime': effective_dates,
+        'date': effective_dates.dt.strftime('%Y-%m-%d'),
+        'time': effective_dates.dt.strftime('%H:%M:%S'),
+    })
+    records = fields.to_dict('records')
+    for column, template in profile.behaviour_columns.items():
+        incidents[column] = [template.format(type=note_type, **values) for note_type, values in zip(notes['Type'].tolist(), records)]
+    incidents['injuries'] = notes['Injuries'].fillna('No Injury') if 'Injuries' in notes else 'No Injury'
+    return incidents.reset_index(drop=True)
+
+# page headers and the like that get copied into a note, cut up to the next section header
+JUNK_MARKERS = ["Facility #", "Effective Date Range"]
+NOTE_SECTION_HEADERS = ["Data :", "Action :", "Response :", "Note Text :"]
+
+# each marker up to the first header after it, or to the end of the note when there is none
+JUNK_SECTION_PATTERNS = [
+    re.compile(re.escape(marker) + "(?:.*?(?=" + "|".join(re.escape(header) for header in NOTE_SECTION_HEADERS) + ")|.*)", re.DOTALL)
+    for marker in JUNK_MARKERS
+]
+
+def remove_junk_sections(text):
+    """Remove the first "Facility #" / "Effective Date Range" section (each) up to the next header (or the end)."""
+    if not isinstance(text, str):
+        return text
+    for pattern in JUNK_SECTION_PATTERNS:
+        text = pattern.sub('', text, count=1)
+    return text
+
+def remove_junk_sections_column(texts):
+    """remove_junk_sections over a whole Series of note texts."""
+    for pattern in JUNK_SECTION_PATTERNS:
+        texts = texts.str.replace(pattern, '', n=1, regex=True)
+    return texts
+
+class NoteWindowIndex:
+    """
+    The notes of some types per resident, sorted by Effective Date, with their
+    other_notes text built once. collect() finds a resident's notes within
+    the window around an incident by bisecting their times instead of
+    scanning every note.
+    """
+
+    def __init__(self, df_notes, note_types, hours=48):
+        self.window = timedelta(hours=hours)
+        self.residents = {}  # resident -> (times, file positions, entries), sorted by time
+        notes = df_notes.assign(_position=range(len(df_notes)), _datetime=pd.to_datetime(df_notes['Effective Date']))
+        notes = notes[notes['Type'].isin(note_types) & notes['Resident Name'].notna() & notes['_datetime'].notna()]
+        for name, group in notes.sort_values(['_datetime', '_position']).groupby('Resident Name', sort=False):
+            entries = [
+                f"{note_type} ({note_datetime.strftime('%Y-%m-%d %H:%M')}): {remove_junk_sections(data)}"
+                for note_type, note_datetime, data in zip(group['Type'], group['_datetime'], group['Data'])
+            ]
+            self.residents[name] = (list(group['_datetime']), list(group['_position']), entries)
+
+    def collect(self, row):
+        """The resident's notes within the window of row['datetime'], in file order, joined with <br>."""
+        resident = self.residents.get(row['name'])
+        if resident is None or pd.isna(row['datetime']):
+            return 'No other notes'
+        times, positions, entries = resident
+        start = bisect_left(times, row['datetime'] - self.window)
+        end = bisect_right(times, row['datetime'] + self.window)
+        collected_notes = [entry for _, entry in sorted(zip(positions[start:end], entries[start:end]))]
+        return '<br>'.join(collected_notes) if collected_notes else 'No other notes'
+
+def collect_other_notes(row, df_notes, other_note_types, index: NoteWindowIndex = None):
+    """Find and match other note types for a specific incident within a 48-hour window."""
+    index = index or NoteWindowIndex(df_notes, other_note_types)
+    return index.collect(row)
+
+async def gpt_summarize_incident(row, openai_api_key, relevant_fields=('behaviour_type', 'description', 'outcome')):
+    """
+    Use OpenAI API to summarize the incident in 1-2 sentences using the specified columns.
+    """
+    # If all relevant fields indicate missing progress note, return short message
+    default_indicators = [
+        "No Progress Note Found Within 24hrs of RIM",
+        "No Progress Note Found Within 24hrs of RIM Within 24hrs of RIM",
+        "No Progress Note Found Within 24hrs of RIM Within 24hrs of RIM Within 24hrs of RIM"
+    ]
+    if all(any(indicator in str(row.get(field, '')) for indicator in default_indicators) for field in relevant_fields):
+        return "No Progress within 24hrs of RIM"
+
+    prompt = f"""
+    Summarize the following incident in 1-2 sentences for a report, nothing more. Use the information provided:
+    Behaviour Type: {row.get('behaviour_type', '')}
+    Description: {row.get('description', '')}
+    Outcome: {row.get('outcome', '')}
+    """
+    try:
+        content = await get_llm_client(openai_api_key).complete(
+            "summary:v1",
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": "You are a healthcare analyst summarizing behaviour incidents for a report. Summarize the incident in 1-2 sentences, include details. Do not include any other text."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.15,
+            max_tokens=60
+        )
+        summary = content.strip()
+        return summary
+    except Exception as e:
+        print(f"Error getting summary from OpenAI: {str(e)}")
+        return "No Progress within 24hrs of RIM"
+
+async def gpt_determine_intent(summary, openai_api_key):
+    """
+    Use OpenAI API to determine if there was intent behind the incident based on the summary.
+    """
+    prompt = f"""
+    Based on the following incident summary, determine if the resident's actions were intentional.
+    The resident's actions are considered intentional if they are goal-oriented, premeditated, or if the resident is cognitively aware and directing their actions towards a specific person or object.
+    Actions that are unintentional may be described as random, purposeless, a result of confusion, or without a clear target.
+
+    Summary: "{summary}"
+
+    Based on this, was the action intentional? Answer only with 'yes' or 'no'.
+    """
+    try:
+        content = await get_llm_client(openai_api_key).complete(
+            "intent:v1",
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": "You are a healthcare analyst determining intent in a resident's actions. Answer only with 'yes' or 'no'."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.0,
+            max_tokens=5
+        )
+        result = content.strip().lower()
+        return 'yes' if result == 'yes' else 'no'
+    except Exception as e:
+        print(f"Error getting intent from OpenAI: {str(e)}")
+        return 'no'
+
+async def gpt_determine_intent_batch(summaries, openai_api_key):
+    """
+    Intent for many incident summaries, several per request (see LLMClient.complete_batch).
+    Summaries the batch could not answer fall back to gpt_determine_intent.
+    """
+    answers = await get_llm_client(openai_api_key).complete_batch(
+        "intent:v1",
+        "For each incident summary, determine if the resident's actions were intentional. "
+        "The resident's actions are considered intentional if they are goal-oriented, premeditated, or if the resident is cognitively aware and directing their actions towards a specific person or object. "
+        "Actions that are unintentional may be described as random, purposeless, a result of confusion, or without a clear target. "
+        "Answer each summary only with 'yes' or 'no'.",
+        summaries,
+        system="You are a healthcare analyst determining intent in residents' actions. Answer only with 'yes' or 'no'.",
+        answer_tokens=5
+    )
+
+    async def resolve(summary, answer):
+        if answer is None:
+            return await gpt_determine_intent(summary, openai_api_key)
+        return 'yes' if answer.lower() == 'yes' else 'no'
+
+    return list(await asyncio.gather(*[resolve(summary, answer) for summary, answer in zip(summaries, answers)]))
+
+def intent_summary(row):
+    """The summary to check for intent when the incident could be a CI, otherwise None."""
+    incident_type = str(row.get('incident_type', '')).lower()
+    who_affected = str(row.get('who_affected', '')).lower()
+    summary = str(row.get('summary', ''))
+
+    # Condition 1: 'Physical Aggression Initiated' in incident_type
+    cond1 = 'physical aggression initiated' in incident_type
+
+    # Condition 2: 'Resident Initiated' and 'Resident Received' in who_affected
+    cond2 = 'resident initiated' in who_affected and 'resident received' in who_affected
+
+    if cond1 and cond2:
+        # Condition 3: GPT determines intent from summary
+        if summary and "no progress" not in summary.lower():
+            return summary
+    return None
+
+async def determine_ci_status(row, openai_api_key):
+    """Determines the CI status based on incident_type, who_affected, and summary."""
+    summary = intent_summary(row)
+    if summary:
+        intent = await gpt_determine_intent(summary, openai_api_key)
+        if intent == 'yes':
+            return 'yes'
+
+    return 'no'
+
+def save_followup_notes_csv(behaviour_csv, output_file, profile: HomeProfile):
+    """Save all followup-type notes from the original notes into a separate CSV file (no time filtering)."""
+    
+    print(f"\nExtracting follow-up notes for {output_file}...")
+
+    # Read the behaviour CSV
+    df_notes = pd.read_csv(behaviour_csv)
+    
+    # Ensure Effective Date is datetime
+    if not pd.api.types.is_datetime64_any_dtype(df_notes['Effective Date']):
+        df_notes = df_notes.copy()
+        df_notes['Effective Date'] = pd.to_datetime(df_notes['Effective Date'])
+
+    # Find follow up notes
+    followups = df_notes[df_notes['Type'].isin(profile.followup_note_types)]
+    data_text = remove_junk_sections_column(followups['Data'].fillna('').astype(str))
+    if profile.drop_empty_notes:
+        keep = ~data_text.isin(["", ","])
+        followups, data_text = followups[keep], data_text[keep]
+    if followups.empty:
+        return None
+
+    note_text = data_text.str.partition("Note Text :")[2].str.strip()
+    df_followup = pd.DataFrame({
+        'id': '',  # not linked to incident id when exporting all followups
+        'resident_name': followups['Resident Name'].map(clean_name),
+        'date': followups['Effective Date'].dt.strftime('%Y-%m-%d'),
+        'time': followups['Effective Date'].dt.strftime('%H:%M:%S'),
+        'other_notes': '',
+        'summary_of_behaviour': note_text.where(data_text.str.contains("Note Text :", regex=False, na=False), data_text),
+    }).reset_index(drop=True)
+
+    # For each extra note, find closest prior follow-up for same resident
+    print(f"Finding matching follow-up notes for extra notes...")
+    extras = df_notes[df_notes['Type'].isin(profile.followup_extra_types)]
+    extras = pd.DataFrame({
+        'resident_name': extras['Resident Name'].map(clean_name).astype(str),
+        'datetime': extras['Effective Date'].astype('datetime64[ns]'),
+        'text': extras['Type'] + ': ' + remove_junk_sections_column(extras['Data'].fillna('').astype(str)),
+        '_order': range(len(extras)),
+    })
+    extras = extras[extras['datetime'].notna()].sort_values('datetime')
+    records = pd.DataFrame({
+        'resident_name': df_followup['resident_name'].astype(str),
+        # the follow-up's time as written to its date and time columns (to the second)
+        '_record_datetime': pd.to_datetime(df_followup['date'] + ' ' + df_followup['time']).astype('datetime64[ns]'),
+        '_record': df_followup.index,
+    })
+    records = records[records['_record_datetime'].notna()]
+    # same-time follow-ups: the backward join takes the last row, which is then the first in the file
+    records = records.sort_values(['_record_datetime', '_record'], ascending=[True, False])
+    linked = pd.merge_asof(extras, records, left_on='datetime', right_on='_record_datetime',
+                           by='resident_name', direction='backward')
+    linked = linked[linked['_record'].notna()].sort_values('_order')
+    if not linked.empty:
+        other_notes = linked.groupby('_record')['text'].agg('<br>'.join)
+        df_followup.loc[other_notes.index.astype(int), 'other_notes'] = other_notes.to_numpy()
+        print(f"Added {len(linked)} extra notes to {len(other_notes)} follow-up notes")
+
+    df_followup.to_csv(output_file, index=False)
+    print(f"Successfully saved followup notes to {output_file}")
+    return output_file
+
+def match_behaviour_notes(df_incidents, df_notes, hours):
+    """
+    For each incident, the index of the same resident's behaviour note closest
+    in time within hours either way (NaN when there is none).
+
+    Ties go to the note that comes first in df_notes, like idxmin over the
+    time differences did: the note just before and the note just after each
+    incident are found with two merge_asof joins by resident, and the
+    nearer one is kept.
+    """
+    tolerance = pd.Timedelta(hours=hours)
+    # merge_asof needs the same dtypes on both sides (datetime unit included)
+    incidents = df_incidents[['name', 'datetime']].assign(_incident=df_incidents.index, name=df_incidents['name'].astype(str),
+                                                          datetime=df_incidents['datetime'].astype('datetime64[ns]'))
+    incidents = incidents[incidents['datetime'].notna()].sort_values('datetime')
+    notes = df_notes[['name', 'datetime']].assign(_note=df_notes.index, _order=range(len(df_notes)), name=df_notes['name'].astype(str),
+                                                  datetime=df_notes['datetime'].astype('datetime64[ns]'))
+    notes = notes[notes['datetime'].notna()]
+
+    def nearest(direction, order_ascending):
+        # among notes at the same time merge_asof takes the last (backward) or first (forward) one
+        right = notes.sort_values(['datetime', '_order'], ascending=[True, order_ascending])
+        joined = pd.merge_asof(incidents, right.rename(columns={'datetime': '_note_datetime'}),
+                               left_on='datetime', right_on='_note_datetime', by='name',
+                               direction=direction, tolerance=tolerance)
+        return joined.set_index('_incident')
+
+    before = nearest('backward', False)
+    after = nearest('forward', True)
+    before_diff = before['datetime'] - before['_note_datetime']
+    after_diff = after['_note_datetime'] - after['datetime']
+    use_after = before['_note'].isna() | (
+        after['_note'].notna() & ((after_diff < before_diff) | ((after_diff == before_diff) & (after['_order'] < before['_order'])))
+    )
+    best = before['_note'].where(~use_after, after['_note'])
+    return best.reindex(df_incidents.index)
+
+def merge_behaviour_data(processed_csv, behaviour_csv, output_file, profile: HomeProfile, openai_api_key=None):
+    """Merge processed incidents with detailed behaviour data."""
+    
+    # Read the CSVs
+    df_processed = pd.read_csv(processed_csv)
+    df_behaviour = pd.read_csv(behaviour_csv)
+    
+    # Clean names in both dataframes
+    df_processed['name'] = df_processed['name'].apply(clean_name)
+    
+    # Convert dates to datetime
+    df_processed['datetime'] = pd.to_datetime(df_processed['date'] + ' ' + df_processed['time'])
+    df_behaviour['Effective Date'] = pd.to_datetime(df_behaviour['Effective Date'])
+    
+    # Process behaviour notes
+    df_behaviour_processed = process_behaviour_notes(df_behaviour, profile)
+    
+    # Initialize the merged dataframe with processed data
+    df_merged = df_processed.copy()
+    
+    # Initialize columns that would come from behaviour notes with default values
+    missing_note_defaults = {
+        'behaviour_type': 'No Progress Note Found Within 24hrs of RIM Within 24hrs of RIM Within 24hrs of RIM',
+        'triggers': 'No Progress Note Found Within 24hrs of RIM Within 24hrs of RIM Within 24hrs of RIM',
+        'description': 'No Progress Note Found Within 24hrs of RIM Within 24hrs of RIM',
+        'consequences': 'No Progress Note Found Within 24hrs of RIM Within 24hrs of RIM',
+        'interventions': 'No Progress Note Found Within 24hrs of RIM Within 24hrs of RIM',
+        'medication_changes': 'No Progress Note Found Within 24hrs of RIM Within 24hrs of RIM',
+        'risks': 'No Progress Note Found Within 24hrs of RIM Within 24hrs of RIM',
+        'outcome': 'No Progress Note Found Within 24hrs of RIM Within 24hrs of RIM',
+        'poa_notified': 'No Progress Note Found Within 24hrs of RIM Within 24hrs of RIM'
+    }
+    # Columns only some note formats have (time_frequency, evaluation)
+    for column in profile.behaviour_columns:
+        missing_note_defaults.setdefault(column, 'No Progress Note Found Within 24hrs of RIM Within 24hrs of RIM')
+    
+    for column, default_value in missing_note_defaults.items():
+        df_merged[column] = default_value
+    
+    # Update merged dataframe with matching behaviour data
+    print("\nMatching incidents with behaviour notes...")
+    if not df_behaviour_processed.empty:
+        matches = match_behaviour_notes(df_merged, df_behaviour_processed, profile.behaviour_match_hours)
+        matched = matches.notna()
+        columns = list(missing_note_defaults.keys())
+        # Update all relevant columns from the matched behaviour notes at once
+        df_merged.loc[matched, columns] = df_behaviour_processed.loc[matches[matched].astype(int), columns].to_numpy()
+        print(f"Found matching behaviour notes for {matched.sum()} of {len(df_merged)} incidents")
+        for _, row in df_merged[~matched].iterrows():
+            print(f"No matching behaviour note found for {row['name']} at {row['datetime']}")
+    else:
+        print("No matching behaviour note types found in behaviour_incidents.csv - using default values")
+    
+    # Add new columns
+    print("\nAdding who affected, code white, PRN, and other notes columns...")
+    default_no_progress = "No Progress Note Found Within 24hrs of RIM Within 24hrs of RIM"
+    relevant_fields = ['behaviour_type', 'description', 'outcome']
+    if openai_api_key:
+        rows = [row for _, row in df_merged.iterrows()]
+        needs_gpt = [not all(str(row.get(field, '')) == default_no_progress for field in relevant_fields) for row in rows]
+        # Incidents are sent several per request
+        answers = iter(get_llm_client(openai_api_key).run(
+            gpt_determine_who_affected_batch([row for row, need in zip(rows, needs_gpt) if need], openai_api_key)
+        ))
+        df_merged['who_affected'] = [next(answers) if need else default_no_progress for need in needs_gpt]
+    else:
+        df_merged['who_affected'] = 'Resident Initiated'  # fallback if no key provided
+    df_merged['code_white'] = df_merged.apply(check_code_white, axis=1)
+    df_merged['prn'] = df_merged.apply(check_prn, axis=1)
+    
+    # Add other_notes column
+    if profile.other_note_types:
+        other_notes = NoteWindowIndex(df_behaviour, profile.other_note_types)
+        df_merged['other_notes'] = df_merged.apply(other_notes.collect, axis=1)
+    # Add summary column using OpenAI
+    if openai_api_key:
+        print("\nGenerating summaries for each incident using OpenAI...")
+        df_merged['summary'] = get_llm_client(openai_api_key).apply(df_merged, lambda row: gpt_summarize_incident(row, openai_api_key, profile.summary_fields))
+    else:
+        df_merged['summary'] = ''
+    
+    # Add CI column
+    if openai_api_key:
+        print("\nDetermining CI status for each incident...")
+        summaries = [intent_summary(row) for _, row in df_merged.iterrows()]
+        # Only possible CIs need the intent check; they are sent several per request
+        intents = iter(get_llm_client(openai_api_key).run(
+            gpt_determine_intent_batch([summary for summary in summaries if summary], openai_api_key)
+        ))
+        df_merged['CI'] = ['yes' if summary and next(intents) == 'yes' else 'no' for summary in summaries]
+    else:
+        df_merged['CI'] = 'no'
+    
+    # Clean up the dataframe
+    df_merged = df_merged.drop(columns=['datetime'])  # Remove the datetime column used for matching
+    
+    # Ensure date and time columns are properly formatted
+    df_merged['date'] = pd.to_datetime(df_merged['date']).dt.strftime('%Y-%m-%d')
+    df_merged['Day of the Week'] = pd.to_datetime(df_merged['date']).dt.day_name()
+    
+    # Fill any remaining NA values
+    df_merged = df_merged.fillna('No Progress Note Found Within 24hrs of RIM Within 24hrs of RIM Within 24hrs of RIM')
+    
+    # Add id column starting from 0
+    df_merged['id'] = range(len(df_merged))
+    
+    # Reorder columns to ensure date, time, and day of the week are at the beginning
+    cols = df_merged.columns.tolist()
+    cols = ['id', 'date', 'time', 'Day of the Week'] + [col for col in cols if col not in ['id', 'date', 'time', 'Day of the Week']]
+    df_merged = df_merged[cols]
+
+    # Drop columns not needed in the final CSV
+    columns_to_drop = [
+        'description',
+        'consequences',
+        'medication_changes',
+        'risks',
+        'outcome'
+    ]
+    df_merged = df_merged.drop(columns=[col for col in columns_to_drop if col in df_merged.columns])
+
+    # Sort by date and time descending (most recent first)
+    df_merged = df_merged.sort_values(by=['date', 'time'], ascending=[False, False]).reset_index(drop=True)
+
+    df_merged.to_csv(output_file, index=False)
+    print(f"\nSuccessfully merged data and saved to {output_file}")
+    
+    return df_merged
+
+def extract_info_from_filename(filename):
+    match = re.search(r'(?P<dashboard>[\w_]+)_(?P<month>\d{2})-(?P<day>\d{2})-(?P<year>\d{4})', filename)
+    if match:
+        dashboard = homes_dict.get(match.group('dashboard'), 'unknown')  
+        year = match.group('year')
+        month = match.group('month')
+        day = match.group('day')
+        return dashboard, year, month, day
+    return None, None, None, None
+
+def process_directory(directory, profile: HomeProfile, manifest: Manifest = None):
+    # days whose inputs are unchanged since the last run are skipped (see manifest.py)
+    manifest = manifest or Manifest(directory)
+    walk_dir = directory
+    if profile.home:
+        walk_dir = os.path.join(directory, profile.analyzed_home(""))
+        if not os.path.exists(walk_dir):
+            os.makedirs(walk_dir)
+
+    for root, dirs, files in os.walk(walk_dir):
+        for file in files:
+            if file.endswith("processed_incidents.csv"):
+                processed_file = os.path.join(root, file)
+                
+                try:
+                    # Construct corresponding behaviour file path
+                    base_name = os.path.basename(processed_file).replace("processed_incidents.csv", "")
+                    behaviour_file_path = os.path.join(root, f"{base_name}behaviour_incidents.csv")
+
+                    if not os.path.exists(behaviour_file_path):
+                        print(f"Skipping: Could not find corresponding behaviour file for {processed_file}")
+                        continue
+
+                    output_file = os.path.join(root, f"{base_name}merged.csv")
+                    inputs = [processed_file, behaviour_file_path]
+                    if manifest.is_current("getBe.merge", inputs, [output_file]):
+                        print(f"Unchanged, skipping: {processed_file}")
+                        continue
+                    
+                    print(f"Merging: {processed_file} and {behaviour_file_path}")
+                    openai_api_key = os.getenv("OPENAI_API_KEY")
+                    if not openai_api_key:
+                        raise ValueError("OPENAI_API_KEY not found in .env file")
+                    
+                    merge_behaviour_data(processed_file, behaviour_file_path, output_file, profile, openai_api_key=openai_api_key)
+                    manifest.record("getBe.merge", inputs, [output_file])
+                    print(f"Successfully created merged file: {output_file}\n")
+
+                except Exception as merge_error:
+                    print(f"Error merging file {processed_file}: {str(merge_error)}\n")
+                    continue
+            
+            if file.endswith("behaviour_incidents.csv") and profile.followup_note_types:
+                behaviour_file_path = os.path.join(root, file)
+                try:
+                    # Save followup notes CSV
+                    output_file = behaviour_file_path.replace("behaviour_incidents.csv", "follow.csv")
+                    if manifest.is_current("getBe.follow", [behaviour_file_path], [output_file]):
+                        continue
+                    # None when the day has no follow-up notes; it is recorded without an output so it is not redone
+                    written = save_followup_notes_csv(behaviour_file_path, output_file, profile)
+                    manifest.record("getBe.follow", [behaviour_file_path], [written] if written else [])
+                except Exception as follow_error:
+                    print(f"Error creating followup notes for {behaviour_file_path}: {str(follow_error)}\n")
+                    continue
+
+def main(profile, argv=None, home_dir=None):
+    profile = get_profile(profile)
+    analyzed_dir = os.path.join(home_dir or profile.directory, "analyzed")
+    parser = argparse.ArgumentParser(description="Merge processed and behaviour incidents for each day")
+    add_manifest_arguments(parser)
+    args = parser.parse_args(argv)
+    process_directory(analyzed_dir, profile, Manifest.from_args(analyzed_dir, args))
+    log_cache_stats()
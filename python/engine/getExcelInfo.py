@@ -0,0 +1,181 @@
+import argparse
+import pandas as pd
+from datetime import datetime
+import os
+import logging
+import shutil
+import re
+from .excel_reader import read_incident_report
+from .homes_db import homes_dict
+from .profiles import HomeProfile, get_profile
+import traceback
+
+def extract_info_from_filename(filename):
+    match = re.search(r'(?P<dashboard>[\w_]+)_(?P<month>\d{2})-(?P<day>\d{2})-(?P<year>\d{4})', filename)
+    if match:
+        dashboard = homes_dict.get(match.group('dashboard'), 'unknown')  
+        year = match.group('year')
+        month = match.group('month')
+        day = match.group('day')
+        return dashboard, year, month, day
+    return None, None, None, None
+
+def collapse_injuries(df, injury_cols):
+    """
+    One injuries string per row: the injuries marked 'Y', sorted and separated
+    by periods, or "No Injury" if none (or only "Unable to determine") are marked.
+    """
+    if not injury_cols:
+        return pd.Series("No Injury", index=df.index)
+    # Remove the ".1" suffix pandas gives the repeated names of the second injury group
+    injury_names = {column: column.split('.')[0] for column in injury_cols}
+    marked = df[injury_cols].eq('Y').rename(columns=injury_names).T.groupby(level=0).any().T
+    injuries = marked.dot(marked.columns.to_series().add('. ').to_numpy(dtype=object)).str[:-2]
+    return injuries.mask(injuries.isin(["", "Unable to determine"]), "No Injury")
+
+def process_excel_file(input_file, output_file, profile: HomeProfile, analyzed_dir="analyzed"):
+    """
+    Process Excel file and create CSV with specified columns and formatting.
+    The CSV is written under analyzed_dir/<home>/<date>/.
+    """
+    # Check if input file exists
+    if not os.path.exists(input_file):
+        logging.info(f"No file found for {input_file}. Skipping.")
+        return
+    
+    # Read the columns we use (cached by file hash, see excel_reader.py)
+    df, injury_cols = read_incident_report(input_file, profile.injury_groups)
+    
+    # Remove rows where "Incident Status" is "Struck Out"
+    df = df[df['Incident Status'] != 'Struck Out']
+    
+    # Split datetime into date and time
+    incident_times = pd.to_datetime(df['Incident Date/Time'])
+    
+    # List of all possible units
+    units = [
+        'Gage North', 'Gage West', 'Lawrence',
+        'Ground W', '2 East', '2 West', '3 East', '3 West',
+        'Shaw', 'Shaw Two', 'Shaw Three',
+        'Pinery', 'Pinery Two', 'Pinery Three',
+        'Wellington', 'Gage',
+        'Floor 1', 'Floor 2', 'Floor 3', 'Floor 4'
+    ]
+
+    def get_building(room):
+        """
+        Extract and process building name from room number.
+        Handles special cases for floors.
+        """
+        if not pd.notna(room):
+            return ''
+            
+        # Floor mapping
+        floor_mapping = {
+            'Floor 1': '1st Floor',
+            'Floor 2': '2nd Floor',
+            'Floor 3': '3rd Floor',
+            'Floor 4': '4th Floor',
+            'Ground': 'Ground W'  # Add mapping for Ground to Ground W
+        }
+        
+        # Convert room to string and strip whitespace
+        room_str = str(room).strip()
+        
+        # First check if it starts with "Floor"
+        for floor_key in floor_mapping:
+            if room_str.startswith(floor_key):
+                return floor_mapping[floor_key]
+        
+        # Check for exact match with "Ground"
+        if room_str == "Ground":
+            return "Ground W"
+        
+        # If it's not a floor, process as before
+        room_parts = room_str.split()
+        if len(room_parts) <= 1:
+            return ''
+            
+        building = ' '.join(room_parts[:-1])
+        
+        # Check if building exists in the units list
+        if building in units:
+            return building
+        return building
+
+    # Create new dataframe with required columns
+    new_df = pd.DataFrame({
+        'incident_number': df['Incident #'],
+        'name': df['Resident Name'],
+        'date': incident_times.dt.strftime('%Y-%m-%d'),
+        'time': incident_times.dt.strftime('%H:%M:%S'),
+        'incident_location': df['Incident Location'],
+        'room': df['Resident Room Number'].apply(get_building) if profile.room_to_building else df['Resident Room Number'],
+        'injuries': collapse_injuries(df, injury_cols),
+        'incident_type': df['Incident Type']
+    })
+    
+    # Remove rows where name AND date are blank
+    new_df = new_df.dropna(subset=['name', 'date'], how='all')
+    
+    # Create the analyzed directory if it doesn't exist
+    if not os.path.exists(analyzed_dir):
+        os.makedirs(analyzed_dir)
+
+    # Determine the home folder from the profile or the input file name
+    home_name = profile.analyzed_home(input_file)
+
+    if home_name:
+        home_dir = os.path.join(analyzed_dir, home_name)
+        
+        # Extract date information from the filename
+        _, year, month, day = extract_info_from_filename(os.path.basename(input_file))
+        if year and month and day:
+            date_dir = os.path.join(home_dir, f"{year}_{month}_{day}")
+            if not os.path.exists(date_dir):
+                os.makedirs(date_dir)
+            
+            # Save the CSV in the date-specific subdirectory
+            new_df.to_csv(os.path.join(date_dir, f"{os.path.splitext(os.path.basename(input_file))[0]}_processed_incidents.csv"), index=False)
+            logging.info(f"CSV file created successfully: {os.path.join(date_dir, f'{os.path.splitext(os.path.basename(input_file))[0]}_processed_incidents.csv')}")
+        else:
+            logging.info(f"Date information not found in file name: {input_file}")
+    else:
+        logging.info(f"No matching home name found for file: {input_file}")
+
+def main(profile, argv=None, home_dir=None):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    profile = get_profile(profile)
+    home_dir = home_dir or profile.directory
+    argparse.ArgumentParser(description="Convert the downloaded incident reports to processed_incidents CSVs.").parse_args(argv)
+
+    # Get the downloads directory path
+    downloads_dir = os.path.join(home_dir, "downloads")
+    analyzed_dir = os.path.join(os.path.abspath(home_dir), "analyzed")
+    
+    # Check if downloads directory exists
+    if not os.path.exists(downloads_dir):
+        logging.info(f"No files found in downloads directory: {downloads_dir}")
+        return
+    
+    # Look for XLS files directly in the downloads directory
+    xls_files = [f for f in os.listdir(downloads_dir) if f.lower().endswith('.xls')]
+    
+    # Check if any XLS files exist
+    if not xls_files:
+        logging.info(f"No XLS files found in {downloads_dir}")
+        return
+    
+    for xls_file in xls_files:
+        xls_path = os.path.join(downloads_dir, xls_file)
+        # Generate output CSV path in the same folder
+        output_csv = os.path.join(downloads_dir, f"{os.path.splitext(xls_file)[0]}_processed_incidents.csv")
+        
+        logging.info(f"Starting Excel processing for: {xls_path}")
+        
+        try:
+            process_excel_file(xls_path, output_csv, profile, analyzed_dir)
+        except Exception as e:
+            logging.error(f"Error processing {xls_path}: {str(e)}")
+            print(traceback.format_exc())
+            continue
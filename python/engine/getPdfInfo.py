@@ -0,0 +1,1212 @@
+import argparse
+import pdfplumber
+import re
+import os
+import json
+import logging
+import pandas as pd
+from datetime import datetime, timedelta
+import glob
+from bisect import bisect_right
+from collections import deque
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor
+from .homes_db import homes_dict
+from .page_cache import get_page_cache
+from .llm_client import get_llm_client, log_cache_stats
+from .profiles import FALL_NOTE_HEADERS, HomeProfile, get_profile
+from dotenv import load_dotenv
+
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '../../.env'))
+
+client = None
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+def _extract_pages(pdf_path: str, page_numbers: list, tolerance: int = 3) -> list:
+    """
+    Worker for sharded extraction. Opens the PDF on its own and returns the raw
+    text of the given pages in order (None for pages without text).
+    """
+    with pdfplumber.open(pdf_path) as pdf:
+        return [pdf.pages[i].extract_text(x_tolerance=tolerance, y_tolerance=tolerance) for i in page_numbers]
+
+def _iter_page_texts(pdf_path: str, page_numbers: list, workers: int, tolerance: int = 3):
+    """Yield raw text for page_numbers in order, split into contiguous shards across a process pool when workers > 1."""
+    if workers <= 1 or len(page_numbers) < 2:
+        with pdfplumber.open(pdf_path) as pdf:
+            for i in page_numbers:
+                yield pdf.pages[i].extract_text(x_tolerance=tolerance, y_tolerance=tolerance)
+        return
+    shard_size = -(-len(page_numbers) // workers)
+    shards = [page_numbers[i:i + shard_size] for i in range(0, len(page_numbers), shard_size)]
+    with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+        # map() yields shard results in submission order, so pages stay in order
+        for shard in executor.map(_extract_pages, [pdf_path] * len(shards), shards, [tolerance] * len(shards)):
+            yield from shard
+
+def iter_text_from_pdf(pdf_path: str, max_pages: int = 500, workers: int = None, use_cache: bool = True, tolerance: int = 3):
+    """
+    Yield the text of each page of a PDF in order as soon as it is available,
+    skipping pages without text, so note segmentation can start before extraction finishes.
+
+    With workers > 1 the page range is split into contiguous shards that are
+    extracted in a process pool, producing the same output as the sequential path.
+    workers defaults to the PDF_EXTRACT_WORKERS environment variable (1 = sequential).
+
+    Page text is cached on disk by file hash and page content hash (see page_cache.py),
+    so an unchanged PDF skips pdfplumber entirely and a grown report only extracts new pages.
+    tolerance is pdfplumber's x/y tolerance (HomeProfile.pdf_tolerance).
+    """
+    if workers is None:
+        workers = int(os.getenv("PDF_EXTRACT_WORKERS", "1"))
+    cache = get_page_cache() if use_cache else None
+    if cache is not None:
+        pages = cache.iter_pages(
+            pdf_path, max_pages,
+            extract=lambda page_numbers: _iter_page_texts(pdf_path, page_numbers, workers, tolerance),
+            salt=f"tolerance={tolerance}"
+        )
+    else:
+        with pdfplumber.open(pdf_path) as pdf:
+            page_count = min(len(pdf.pages), max_pages)
+        pages = _iter_page_texts(pdf_path, list(range(page_count)), workers, tolerance)
+    for text in pages:
+        if text:
+            yield text
+
+def extract_text_from_pdf(pdf_path: str, max_pages: int = 500, workers: int = None, use_cache: bool = True, tolerance: int = 3) -> list:
+    """
+    Extract text from a PDF file, returning a list of page contents.
+    Each element in the list represents one page's text.
+    """
+    try:
+        return list(iter_text_from_pdf(pdf_path, max_pages, workers, use_cache, tolerance))
+    except Exception as e:
+        logging.error(f"Error extracting text from PDF: {str(e)}")
+        return []
+
+RESIDENT_NAME_PATTERN = re.compile(r"Resident Name\s*:\s*([^0-9]+?)\d")
+
+#get the resident name from each page header
+def getResidentNameFromHeader(pageText: str) -> str:
+    # Look for "Resident Name" followed by ":" and capture everything up to the first number
+    nameMatch = RESIDENT_NAME_PATTERN.search(pageText)
+    if nameMatch:
+        # Get the matched name and clean it up
+        name = nameMatch.group(1).strip()
+        
+        # Remove any remaining brackets and trailing spaces
+        name = re.sub(r'\s*\(+\s*$', '', name).strip()
+        
+        return name
+    return "Unknown"
+
+#start offset of each page in the '\n\n'-joined document text
+def buildPageOffsets(pagesText: list) -> list:
+    pageOffsets = []
+    currentPosition = 0
+    for pageText in pagesText:
+        pageOffsets.append(currentPosition)
+        currentPosition += len(pageText) + 2  # +2 for the '\n\n' we add between pages
+    return pageOffsets
+
+#find the page associated with each effective date (binary search over the page offsets)
+def findPosition(pagesText: list, targetP: int, pageOffsets: list = None) -> tuple:
+    if pageOffsets is None:
+        pageOffsets = buildPageOffsets(pagesText)
+    i = bisect_right(pageOffsets, targetP) - 1
+    if i < 0 or targetP >= pageOffsets[i] + len(pagesText[i]) + 2:
+        return -1, -1, -1
+    return i, targetP - pageOffsets[i], pageOffsets[i]
+
+EFFECTIVE_DATE_PATTERN = re.compile(r'Effective Date:')
+NOTE_DATE_PATTERN = re.compile(r"Effective Date:\s*(\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2})")
+ANY_TYPE_PATTERN = re.compile(r"Type:\s*([^\n]+)")
+HEADER_FOOTER_PATTERN = re.compile(r"^(Facility #|Date:|Time:|Primary Physician:|User:|Progress Notes|Admission|Date of Birth|Gender|Allergies|Diagnoses|Location|Medical Record #|Physician|Pharmacy|Page \\d+ of \\d+|Author:|Signature:)")
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+#get the positions of the words "effective date" from the pdf
+def findEffectiveDates(allText: str) -> list:
+    return [m.start() for m in EFFECTIVE_DATE_PATTERN.finditer(allText)]
+
+def parseNoteSection(section: str, pageIndex: int, profile: HomeProfile, noteTypePattern=None):
+    """
+    Parse one note section (its 'Effective Date:' up to the next one) into
+    (noteDate, noteType, noteContent), or None if the note is not kept.
+    pageIndex is the page the note starts on and is only used for logging.
+    Which note types are kept comes from the home profile.
+    """
+    section = section.strip()
+    dateMatch = NOTE_DATE_PATTERN.search(section)
+    if not dateMatch:
+        logging.debug(f"No date match found in section on page {pageIndex + 1}")
+        return None
+    noteDate = dateMatch.group(1)
+
+    typeMatch = (noteTypePattern or profile.note_type_regex).search(section)
+    if not typeMatch:
+        logging.debug(f"No behaviour note type found in section on page {pageIndex + 1}")
+        typeSearch = ANY_TYPE_PATTERN.search(section)
+        if typeSearch:
+            logging.debug(f"Found type instead: {typeSearch.group(1)}")
+        return None
+    
+    if profile.skip_multi_type_lines:
+        # Skip if this is the false match line with multiple types listed together
+        type_line_start = typeMatch.start()
+        type_line_end = section.find('\n', type_line_start)
+        if type_line_end == -1:
+            type_line_end = len(section)
+        type_line = section[type_line_start:type_line_end].strip()
+        
+        if type_line.count(',') > 0:  # Skip if the Type line contains commas (multiple types)
+            return None
+    
+    noteType = typeMatch.group(1)
+
+    # Extract note content robustly, skipping headers/footers after page breaks
+    typeEnd = typeMatch.end()
+    noteContent = section[typeEnd:].strip()
+    # Split on double newlines (page breaks)
+    noteContentParts = noteContent.split("\n\n")
+    cleanedParts = []
+    for part in noteContentParts:
+        lines = part.splitlines()
+        # Remove lines that look like headers/footers
+        lines = [line for line in lines if not HEADER_FOOTER_PATTERN.match(line.strip())]
+        cleaned = " ".join(lines).strip()
+        if cleaned:
+            cleanedParts.append(cleaned)
+    noteContent = " ".join(cleanedParts)
+    noteContent = WHITESPACE_PATTERN.sub(' ', noteContent).strip()
+
+    if not profile.keeps_note_type(noteType):
+        return None
+    if profile.drop_empty_notes and noteContent in ("", ","):
+        return None
+    return noteDate, noteType, noteContent
+
+def iterFallNotes(pages, profile: HomeProfile):
+    """
+    Stream note entries from page texts in document order.
+
+    Pages are consumed one at a time (any iterable, e.g. iter_text_from_pdf) and
+    each entry is yielded as soon as its section is complete and its resident
+    name is known, without building a whole-document string. A section runs from
+    its 'Effective Date:' to the next one and spans page breaks as '\n\n', exactly
+    like the joined text did. The resident name comes from the header of the page
+    the note starts on, falling back to the next and next-next page.
+    """
+    noteTypePattern = profile.note_type_regex
+    headerNames = []
+    pending = deque()     # (startPage, noteDate, noteType, noteContent) waiting on look-ahead headers
+    sectionParts = None   # pieces of the section currently being read
+    sectionPage = -1
+    noteCount = 0
+
+    def resolveName(startPage, final):
+        for i in range(startPage, startPage + 3):
+            if i >= len(headerNames):
+                return "Unknown" if final else None
+            if headerNames[i] != "Unknown":
+                return headerNames[i]
+        return "Unknown"
+
+    def closeSection():
+        note = parseNoteSection("".join(sectionParts), sectionPage, profile, noteTypePattern)
+        if note:
+            pending.append((sectionPage,) + note)
+
+    def readyEntries(final=False):
+        while pending:
+            residentName = resolveName(pending[0][0], final)
+            if residentName is None:
+                return
+            _, noteDate, noteType, noteContent = pending.popleft()
+            logging.info(f"found entry - Date: {noteDate}, Resident: {residentName}, Type: {noteType}")
+            yield {
+                "Effective Date": noteDate,
+                "Resident Name": residentName,
+                "Type": noteType,
+                "Data": noteContent
+            }
+
+    for pageIndex, pageText in enumerate(pages):
+        headerNames.append(getResidentNameFromHeader(pageText))
+        positions = [m.start() for m in EFFECTIVE_DATE_PATTERN.finditer(pageText)]
+        if sectionParts is not None:
+            sectionParts.append("\n\n")
+            sectionParts.append(pageText[:positions[0]] if positions else pageText)
+        for i, pos in enumerate(positions):
+            if sectionParts is not None:
+                closeSection()
+            end = positions[i + 1] if i + 1 < len(positions) else len(pageText)
+            sectionParts = [pageText[pos:end]]
+            sectionPage = pageIndex
+            noteCount += 1
+        yield from readyEntries()
+
+    if sectionParts is not None:
+        closeSection()
+    yield from readyEntries(final=True)
+    logging.debug(f"Found {noteCount} 'Effective Date:' patterns")
+
+def getAllFallNotesInfo(pagesText: list, profile: HomeProfile):
+    return list(iterFallNotes(pagesText, profile))
+
+def csvLook(df, csv_file="behaviour_incidents.csv", profile: HomeProfile = None):
+    """
+    Reads the CSV file and updates the Type column from 'Incident - Falls' to 'Post Fall - Nursing'
+    if 5 or more specified fields appear consecutively with no content between them.
+    
+    Args:
+        df (pd.DataFrame): Notes from the previous stage
+        csv_file (str): Path to the CSV file. Defaults to 'behaviour_incidents.csv'
+    """
+    try:
+        # Fields to check, in order they typically appear
+        fields_to_check = [
+            r"History of Falls\s*:",
+            r"Resident activity/needs at the time of the fall[^:]*:",
+            r"Location of Fall[^:]*:",
+            r"What foot wear did the resident wear\s*:",
+            r"Physical Status of Resident at time of fall[^:]*:",
+            r"What mechanical devices were in use[^:]*:",
+            r"Environmental status at time of fall[^:]*:",
+            r"List any medication changes within the past week\s*:",
+            r"Note if resident is on any anticoagulants:\s*:",
+            r"Head to Toe Assessment findings:[^:]*:",
+            r"Range of Motion and Weight bearing status\s*:",
+            r"Fracture \(Shortening of limbs[^:]*:",
+            r"Current Status of Resident[^:]*:"
+        ]
+        
+        def check_consecutive_blank_fields(text):
+            if pd.isna(text):
+                return False
+                
+            # Convert text to single line to make pattern matching easier
+            text = ' '.join(text.split())
+            
+            # Count fields that are effectively empty
+            empty_fields = 0
+            total_fields_found = 0
+            
+            for field in fields_to_check:
+                # Find the current field in the text
+                field_match = re.search(field, text)
+                if not field_match:
+                    continue
+                    
+                total_fields_found += 1
+                current_pos = field_match.end()
+                
+                # Look for the next field or end of text
+                next_pos = len(text)
+                for next_field in fields_to_check:
+                    next_match = re.search(next_field, text[current_pos:])
+                    if next_match:
+                        next_pos = current_pos + next_match.start()
+                        break
+                
+                # Get content between fields
+                content = text[current_pos:next_pos].strip()
+                # Consider a field empty if it only contains ":" or "Yes." or very short content
+                if not content or content in [':', 'Yes.', 'Yes'] or len(content) <= 5:
+                    empty_fields += 1
+            
+            # If we found at least 8 fields and most are empty, consider it a Post Fall note
+            return total_fields_found >= 8 and empty_fields >= (total_fields_found * 0.75)
+        
+        # Create a mask for rows that meet both conditions:
+        # 1. Type is 'Incident - Falls'
+        # 2. Has 5 or more consecutive blank fields
+        mask = (df['Type'] == 'Incident - Falls') & \
+               (df['Data'].apply(check_consecutive_blank_fields))
+        
+        # Update the Type column where the mask is True
+        df.loc[mask, 'Type'] = 'Post Fall - Nursing'
+        
+        # Log the number of changes made
+        changes_made = mask.sum()
+        logging.info(f"Updated {changes_made} records in {csv_file}")
+        
+        return df
+        
+    except Exception as e:
+        logging.error(f"Error processing CSV file: {str(e)}")
+        
+#save to a csv called behaviour_incidents.csv in the same directory that this file is run
+def save_to_csv(df, output_file="behaviour_incidents.csv"):
+    df.to_csv(output_file, index=False)
+    logging.info(f"Successfully saved {len(df)} entries to {output_file}")
+
+def csvRemoveHeader(df, csv_file="behaviour_incidents.csv", profile: HomeProfile = None):
+    """
+    Removes header information starting with each of the profile's junk markers
+    ('Facility #' by default) from the Data column, up to the next section header
+    of the note's type.
+    
+    Args:
+        df (pd.DataFrame): Notes from the previous stage
+        csv_file (str): Path to the CSV file. Defaults to 'behaviour_incidents.csv'
+        profile (HomeProfile): Home the notes belong to
+    """
+    try:
+        def clean_note(note, note_type):
+            if pd.isna(note):
+                return note
+            
+            headers = list(profile.section_headers.get(note_type, FALL_NOTE_HEADERS))
+            # Check if note contains "LATE ENTRY"
+            if profile.late_entry_header and "LATE ENTRY" in note:
+                # Add "LATE ENTRY" as the first header
+                headers = ["LATE ENTRY"] + headers
+            
+            # Remove repeated junk sections ('Facility #' page headers and the like)
+            for marker in profile.junk_markers:
+                while marker in note:
+                    marker_index = note.find(marker)
+                    
+                    # Find the next header or the last section
+                    next_header_index = len(note)
+                    section_end = None
+                    
+                    # Try to find the next section header
+                    for header in headers:
+                        header_pos = note.find(header, marker_index)
+                        if header_pos != -1 and header_pos < next_header_index:
+                            next_header_index = header_pos
+                            section_end = header_pos
+                    
+                    # If no header found, try to find POA section or last section
+                    if section_end is None:
+                        poa_section = note.find("POA aware and response of POA", marker_index)
+                        if poa_section != -1 and poa_section < next_header_index:
+                            section_end = poa_section
+                    
+                    # If still no section end found, remove until the end of the note
+                    if section_end is None:
+                        section_end = len(note)
+                    
+                    # Remove from the marker to the next section
+                    note = note[:marker_index] + note[section_end:]
+            
+            return note.strip()
+        
+        # Apply the cleaning function to each row
+        df['Data'] = df.apply(lambda row: clean_note(row['Data'], row['Type']), axis=1)
+        
+        logging.info(f"Cleaned header information from {csv_file}")
+        
+        return df
+        
+    except Exception as e:
+        logging.error(f"Error cleaning CSV headers: {str(e)}")
+
+def filter_behaviour_note_data(df, csv_file="behaviour_incidents.csv", profile: HomeProfile = None):
+    """
+    Filter out note data for the "Data" column when the first instance of "Responsive Behaviour" appears
+    in Behaviour Note entries, but if there is a "Behaviour Displayed:" after "Responsive Behaviour",
+    keep what's before "Responsive Behaviour" and after "Behaviour Displayed:", removing the middle.
+    Only runs for homes with truncate_behaviour_notes set.
+    
+    Args:
+        df (pd.DataFrame): Notes from the previous stage
+        csv_file (str): Path to the CSV file. Defaults to 'behaviour_incidents.csv'
+        profile (HomeProfile): Home the notes belong to
+    """
+    if not profile.truncate_behaviour_notes:
+        return df
+    try:
+        def smart_truncate_behaviour_note(data, note_type):
+            """
+            Truncate the data at the first occurrence of 'Responsive Behaviour' for Behaviour Notes,
+            but if 'Behaviour Displayed:' is found after, keep what's before 'Responsive Behaviour'
+            and after 'Behaviour Displayed:', removing the middle.
+            """
+            if pd.isna(data) or note_type == "Responsive Behaviour Assessment":
+                return data
+
+            data_str = str(data)
+            rb_pos = data_str.find("Responsive Behaviour")
+            if rb_pos == -1:
+                # No "Responsive Behaviour" found, return original data
+                return data
+
+            # Look for "Behaviour Displayed:" after "Responsive Behaviour"
+            bd_pos = data_str.find("Behaviour Displayed :", rb_pos)
+            if bd_pos != -1:
+                # Keep before "Responsive Behaviour" and after "Behaviour Displayed:"
+                before = data_str[:rb_pos].rstrip()
+                after = data_str[bd_pos:].lstrip()
+                # If both before and after exist, join with a space or newline
+                if before and after:
+                    return before + "\n" + after
+                elif before:
+                    return before
+                else:
+                    return after
+            else:
+                # Only "Responsive Behaviour" found, truncate at that position
+                return data_str[:rb_pos].strip()
+        
+        # Apply the truncation function to each row
+        df['Data'] = df.apply(lambda row: smart_truncate_behaviour_note(row['Data'], row['Type']), axis=1)
+        
+        logging.info(f"Filtered Behaviour Note data at 'Responsive Behaviour' occurrences in {csv_file}")
+        
+        return df
+        
+    except Exception as e:
+        logging.error(f"Error filtering Behaviour Note data: {str(e)}")
+
+# Define all possible injury categories
+INJURY_GROUP1 = [
+    'abrasion', 'bleeding', 'broken skin', 'bruising', 'bruise', 'burn', 
+    'dislocation', 'fracture', 'frostbite', 'hematoma', 
+    'hypoglycemia', 'incision'
+]
+
+INJURY_GROUP2 = [
+    'laceration', 'pain', 'redness', 'scratches', 'skin tear',
+    'sprain', 'strain', 'swelling', 'unconscious', 'contusion'
+]
+
+ALL_INJURY_TYPES = set(INJURY_GROUP1 + INJURY_GROUP2)
+
+# "combined" asks for all injury categories and the head injury flag in one JSON call per note,
+# "separate" keeps the original two injury calls plus a head injury call
+INJURY_DETECTION_MODE = os.getenv("INJURY_DETECTION_MODE", "combined")
+
+# Process responses and validate injuries
+def validate_injuries(response_text, valid_injuries):
+    if response_text.lower() == "none":
+        return []
+    
+    # Split the response and clean each term
+    potential_injuries = [term.strip().lower() for term in response_text.split(',')]
+    
+    # Only keep terms that match our predefined injury categories
+    valid_terms = [term for term in potential_injuries if term in valid_injuries]
+    return valid_terms
+
+async def classify_injuries(data, note_type, previous_injuries):
+    """
+    Detect injuries and a head injury in one GPT call that answers in JSON.
+    Only process notes with no previous injuries.
+    
+    Returns:
+        tuple: (injuries, head_injury) where injuries is the same comma separated
+        string detect_injuries returns and head_injury is a bool
+    """
+    # Skip processing if previous injuries exist
+    if previous_injuries != "No Previous Injuries":
+        return previous_injuries, False
+    
+    if pd.isna(data):
+        return 'No Injury', False
+    
+    data = str(data)
+    
+    try:
+        prompt = f"""
+        Carefully review the following medical note and determine which of these specific injuries are present: 
+        {', '.join(INJURY_GROUP1 + INJURY_GROUP2)}
+        
+        Only list injuries that are actually present and current (not denied, not old injuries, not "no signs of"). 
+        E.X. do not list pain as an injury if the note states the resident denies pain or if there was no noted sign of pain
+        
+        Also determine if there is any indication of a physical head injury.
+        Look for terms like head trauma, impact to head, head wound, scalp injury, etc. Any issues with cognition and imbalance and head nodding are not indications of head injury
+        Do not confuse occurances of "head injury routine" with a current head injury, they are not the same.
+        Analyze the note twice before giving an answer and don't confuse the fall note headings for head injury information.
+        
+        Respond with a JSON object with two keys:
+        "injuries": the injury terms from the provided list separated by commas, or "None" if none are present
+        "head_injury": "Yes" or "No"
+        
+        Note: {data}
+        """
+        
+        print(f"\nAnalyzing note: {data[:200]}...")  # Print first 200 chars of note
+        
+        content = await client.complete(
+            "injuries_combined:v2",
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": "You are a medical assistant trained to detect specific injuries and head injuries in medical notes. Answer in JSON."},
+                {"role": "user", "content": prompt}
+            ],
+            response_format={"type": "json_object"},
+            max_tokens=80,
+            temperature=0.1
+        )
+        try:
+            answer = json.loads(content)
+        except json.JSONDecodeError:
+            answer = None
+        if not isinstance(answer, dict):
+            # Fall back to the one-question-per-call prompts for this note
+            logging.warning("Combined injury answer was not a JSON object, falling back to separate calls")
+            return await detect_injuries(data, note_type, previous_injuries), await checkForHeadInjury(data, previous_injuries)
+        injuries_text = answer.get("injuries") or "None"
+        if isinstance(injuries_text, list):
+            injuries_text = ", ".join(str(term) for term in injuries_text) or "None"
+        head_injury = "yes" in str(answer.get("head_injury", "")).lower()
+    except Exception as e:
+        print(f"Error in injury detection: {str(e)}")
+        logging.error(f"Error in injury detection: {str(e)}")
+        return 'No Injury', False
+    
+    all_injuries = sorted(set(validate_injuries(str(injuries_text).strip(), ALL_INJURY_TYPES)))
+    result = ', '.join(all_injuries) if all_injuries else 'No Injury'
+    print(f"Final validated result: {result}, head injury: {head_injury}\n")
+    return result, head_injury
+
+async def detect_injuries(data, note_type, previous_injuries):
+    """
+    Detect injuries in the note using GPT API to analyze the content.
+    Only process notes with no previous injuries.
+    """
+    # Skip processing if previous injuries exist
+    if previous_injuries != "No Previous Injuries":
+        return previous_injuries
+    
+    if pd.isna(data):
+        return 'No Injury'
+    
+    data = str(data)
+    
+    try:
+        # First API call for injury group 1
+        prompt1 = f"""
+        Carefully review the following medical note and determine which of these specific injuries are present: 
+        {', '.join(INJURY_GROUP1)}
+        
+        Only list injuries that are actually present and current (not denied, not old injuries, not "no signs of"). 
+        E.X. do not list pain as an injury if the note states the resident denies pain or if there was no noted sign of pain
+        List ONLY the injury terms from the provided list, separated by commas. If none are present, respond with "None".
+        
+        Note: {data}
+        """
+        
+        print(f"\nAnalyzing note: {data[:200]}...")  # Print first 200 chars of note
+        
+        content1 = await client.complete(
+            "injuries_group1:v1",
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": "You are a medical assistant trained to detect specific injuries in medical notes."},
+                {"role": "user", "content": prompt1}
+            ],
+            max_tokens=50,
+            temperature=0.1
+        )
+        
+        # Second API call for injury group 2
+        prompt2 = f"""
+        Carefully review the following medical note and determine which of these specific injuries are present: 
+        {', '.join(INJURY_GROUP2)}
+        
+        Only list injuries that are actually present and current (not denied, not old injuries, not "no signs of").
+        E.X. do not list pain as an injury if the note states the resident denies pain or if there was no noted sign of pain
+        List ONLY the injury terms from the provided list, separated by commas. If none are present, respond with "None".
+        
+        Note: {data}
+        """
+        
+        content2 = await client.complete(
+            "injuries_group2:v1",
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": "You are a medical assistant trained to detect specific injuries in medical notes."},
+                {"role": "user", "content": prompt2}
+            ],
+            max_tokens=50,
+            temperature=0.1
+        )
+        
+        # Get validated injuries from both responses
+        injuries1 = validate_injuries(content1.strip(), ALL_INJURY_TYPES)
+        injuries2 = validate_injuries(content2.strip(), ALL_INJURY_TYPES)
+        
+        print(f"Group 1 validated injuries: {injuries1}")
+        print(f"Group 2 validated injuries: {injuries2}")
+        
+        # Combine validated injuries from both responses
+        all_injuries = sorted(set(injuries1 + injuries2))
+        
+        result = ', '.join(all_injuries) if all_injuries else 'No Injury'
+        print(f"Final validated result: {result}\n")
+        return result
+        
+    except Exception as e:
+        print(f"Error in injury detection: {str(e)}")
+        logging.error(f"Error in injury detection: {str(e)}")
+        return 'No Injury'
+    
+def add_injuries_column(df, csv_file="behaviour_incidents.csv", profile: HomeProfile = None):
+    """
+    Add or update the Injuries column in the CSV file using GPT detection.
+    Only detect injuries for rows with no previous injuries.
+    
+    Args:
+        df (pd.DataFrame): Notes from the previous stage
+        csv_file (str): Path to the CSV file. Defaults to 'behaviour_incidents.csv'
+    """
+    try:
+        # Ensure Previous_Injuries column exists, default to 'No Previous Injuries' if not
+        if 'Previous_Injuries' not in df.columns:
+            df['Previous_Injuries'] = 'No Previous Injuries'
+        
+        # Process each row and print progress
+        print(f"\nProcessing {len(df)} notes for injuries...")
+        
+        # Only use GPT for rows with no previous injuries (rows are sent concurrently)
+        if INJURY_DETECTION_MODE == "combined":
+            results = client.apply(
+                df,
+                lambda row: classify_injuries(row['Data'], row['Type'], row['Previous_Injuries'])
+            )
+            df['Injuries'] = results.map(lambda result: result[0])
+            # Kept for add_head_injury_column so it does not ask again
+            df['Head_Injury_Flag'] = results.map(lambda result: result[1])
+        else:
+            df['Injuries'] = client.apply(
+                df,
+                lambda row: detect_injuries(row['Data'], row['Type'], row['Previous_Injuries'])
+            )
+        
+        logging.info(f"Updated injuries column in {csv_file}")
+        
+        return df
+        
+    except Exception as e:
+        logging.error(f"Error updating injuries column: {str(e)}")
+
+async def checkForHeadInjury(note: str, previous_injuries: str) -> bool:
+    """
+    Use OpenAI's GPT API to check for potential head injuries in the note.
+    Only process notes with no previous injuries.
+    
+    Args:
+        note (str): The text content of the note
+        previous_injuries (str): Previous injuries for the note
+    
+    Returns:
+        bool: True if head injury is detected, False otherwise
+    """
+    # Skip processing if previous injuries exist
+    if previous_injuries != "No Previous Injuries":
+        return False
+    
+    try:
+        # Prepare the prompt for GPT
+        prompt = f"""
+        Carefully review the following medical note and determine if there is any indication of a physical head injury. 
+        Look for terms like head trauma, impact to head, head wound, scalp injury, etc. Any issues with cognition and imbalance and head nodding are not indications of head injury
+        Do not confuse occurances of "head injury routine" with a current head injury, they are not the same.
+        Analyze the note twice before giving an answer and don't confuse the fall note headings for head injury information.
+        Respond with ONLY 'Yes' or 'No'.
+        
+        Note: {note}
+        
+        Are there any signs of a head injury in this note?
+        """
+        
+        # Make API call
+        content = await client.complete(
+            "head_injury:v1",
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": "You are a medical assistant trained to detect head injuries in medical notes."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=10,
+            temperature=0.2
+        )
+        
+        # Extract and process the response
+        gpt_response = content.lower().strip()
+        
+        return 'yes' in gpt_response
+    
+    except Exception as e:
+        logging.error(f"Error in head injury detection: {str(e)}")
+        return False
+
+def add_head_injury_column(df, csv_file="behaviour_incidents.csv", profile: HomeProfile = None):
+    """
+    Add a head injury column to the existing CSV file using GPT detection.
+    Only detect head injuries for rows with no previous injuries.
+    
+    Args:
+        df (pd.DataFrame): Notes from the previous stage
+        csv_file (str): Path to the CSV file. Defaults to 'behaviour_incidents.csv'
+    """
+    try:
+        # Ensure Previous_Injuries column exists, default to 'No Previous Injuries' if not
+        if 'Previous_Injuries' not in df.columns:
+            df['Previous_Injuries'] = 'No Previous Injuries'
+        
+        # Add head injury detection, reusing the flag from the combined injury call when present
+        if 'Head_Injury_Flag' in df.columns:
+            df['Temp_Head_Injury'] = df.pop('Head_Injury_Flag').astype(bool)
+        else:
+            df['Temp_Head_Injury'] = client.apply(
+                df,
+                lambda row: checkForHeadInjury(str(row['Data']), row['Previous_Injuries'])
+            )
+        
+        # Modify Injuries column if Head Injury is detected
+        df['Injuries'] = df.apply(
+            lambda row: row['Injuries'] + ', Head Injury' 
+            if row['Temp_Head_Injury'] and row['Injuries'] != 'No Injury' 
+            else ('Head Injury' if row['Temp_Head_Injury'] else row['Injuries']), 
+            axis=1
+        )
+        
+        # Drop the temporary column
+        df = df.drop(columns=['Temp_Head_Injury'])
+        
+        logging.info(f"Added head injury detection to {csv_file}")
+        
+        return df
+        
+    except Exception as e:
+        logging.error(f"Error adding head injury column: {str(e)}")
+
+def clean_injury_list(df, csv_file="behaviour_incidents.csv", profile: HomeProfile = None):
+    """
+    Clean the injuries column by verifying each listed injury actually appears in the note text.
+    For Incident - Falls notes, only checks text between headers in their specific order.
+    
+    Args:
+        df (pd.DataFrame): Notes from the previous stage
+        csv_file (str): Path to the CSV file. Defaults to 'behaviour_incidents.csv'
+    """
+    try:
+        def verify_injuries(injuries_str, note_text, note_type):
+            if pd.isna(injuries_str) or injuries_str == 'No Injury':
+                return 'No Injury'
+            
+            note_text = note_text.lower()
+            validated_injuries = []
+            injuries = [inj.strip() for inj in injuries_str.split(',')]
+            
+            # For Incident - Falls, we need to check only the text between headers
+            if note_type == "Incident - Falls":
+                # Headers in their exact order
+                headers = [
+                    "Description and Time of Fall :",
+                    "History of Falls :",
+                    "Resident activity/needs at the time of the fall (i.e. getting in out of bed, chair, in pain etc.) :",
+                    "Location of Fall (room,dining room, toilet,shower etc) :",
+                    "What foot wear did the resident wear? :",
+                    "Physical Status of Resident at time of fall (i.e. pain, dizziness, change in lab values, drop in BS) :",
+                    "What mechanical devices were in use (i.e. high low bed, senor etc) :",
+                    "Environmental status at time of fall (i.e. w/c locked, room light, call bell accessible, etc.) :",
+                    "List any medication changes within the past week :",
+                    "Note if resident is on any anticoagulants: :",
+                    "Head to Toe Assessment findings: (soft tissue injury, bruising, laceration, hematoma, HIR etc.) :",
+                    "Range of Motion and Weight bearing status :",
+                    "Fracture (Shortening of limbs & external and/or internal rotation of limbs) :",
+                    "Current Status of Resident (is it safe to transfer resident?) :",
+                    "Interventions in place to prevent further falls :",
+                    "POA aware and response of POA :",
+                    "Notify Pharmacist if applicable :",
+                    "Physio Referral completed :"
+                ]
+                
+                # Extract text between headers
+                relevant_text = ""
+                for i, header in enumerate(headers):
+                    header_pos = note_text.find(header.lower())
+                    if header_pos != -1:
+                        # Find the start of next header or end of text
+                        if i < len(headers) - 1:
+                            next_header_pos = note_text.find(headers[i + 1].lower())
+                            if next_header_pos == -1:
+                                section_text = note_text[header_pos + len(header):].strip()
+                            else:
+                                section_text = note_text[header_pos + len(header):next_header_pos].strip()
+                        else:
+                            section_text = note_text[header_pos + len(header):].strip()
+                        
+                        # Only add text from relevant sections where injuries might be documented
+                        if any(key_header in header.lower() for key_header in [
+                            "description", "head to toe assessment", 
+                            "range of motion", "current status", 
+                            "physical status", "fracture"
+                        ]):
+                            relevant_text += section_text + " "
+                
+                # Use only the relevant text for injury verification
+                search_text = relevant_text.lower()
+            else:
+                # For other note types, use the entire note
+                search_text = note_text.lower()
+            
+            # Verify each injury
+            for injury in injuries:
+                injury = injury.strip().lower()
+                # Special case for 'bruising' to change to 'bruise'
+                if injury == 'bruising':
+                    injury = 'bruise'
+                # Special case for 'broken skin'
+                if injury == 'broken skin':
+                    if any(term in search_text for term in ['broken skin', 'skin break', 'break in skin']):
+                        validated_injuries.append(injury)
+                # Special case for 'skin tear'
+                elif injury == 'skin tear':
+                    if 'skin tear' in search_text or ('skin' in search_text and 'tear' in search_text and len(search_text.split('skin')) == len(search_text.split('tear'))):
+                        validated_injuries.append(injury)
+                # Check for 'head injury' specifically
+                elif injury == 'head injury':
+                    if ('head injury' in search_text or 
+                        'hit head' in search_text or 
+                        'struck head' in search_text or 
+                        'impact to head' in search_text):
+                        validated_injuries.append(injury)
+                # Regular injuries check
+                elif injury in search_text:
+                    # Additional verification to ensure it's not part of a negative statement
+                    surrounding_text = search_text[max(0, search_text.find(injury) - 20):
+                                                 min(len(search_text), search_text.find(injury) + len(injury) + 20)]
+                    if not any(neg in surrounding_text for neg in ['no ', 'not ', 'denies ', 'negative for ', 'none', 'without']):
+                        validated_injuries.append(injury)
+            
+            return ', '.join(validated_injuries) if validated_injuries else 'No Injury'
+        
+        # Process each row
+        print("\nValidating injuries against note content...")
+        df['Injuries'] = df.apply(lambda row: verify_injuries(row['Injuries'], str(row['Data']), row['Type']), axis=1)
+        
+        logging.info(f"Cleaned injuries column in {csv_file}")
+        
+        return df
+        
+    except Exception as e:
+        logging.error(f"Error cleaning injuries column: {str(e)}")
+
+def searchFalls(df, csv_file="behaviour_incidents.csv", profile: HomeProfile = None):
+    """
+    Look through CSV for Incident - Falls notes on the same day for the same resident.
+    Compare against processed_incidents.csv to ensure we don't delete legitimate multiple falls.
+    Remove only excess duplicate rows beyond the number of actual falls recorded.
+    
+    Args:
+        df (pd.DataFrame): Notes from the previous stage
+        csv_file (str): Path to the CSV file. Defaults to 'behaviour_incidents.csv'
+    """
+    try:
+        # Get the original filename from the current CSV path
+        # Remove '_behaviour_incidents.csv' to get the base filename
+        base_filename = os.path.basename(csv_file).replace('_behaviour_incidents.csv', '')
+        
+        # Parse the date from the filename (format: home_unit_MM-DD-YYYY_xxxx)
+        match = re.search(r'(\w+)_(\w+)_(\d{2})-(\d{2})-(\d{4})_', base_filename)
+        if not match:
+            logging.error(f"Could not parse filename format: {base_filename}")
+            return
+            
+        home, unit, month, day, year = match.groups()
+        home_unit = f"{home}_{unit}"
+
+        full_csv_path = os.path.abspath(csv_file)
+        currents_dir = os.path.dirname(full_csv_path)  # Gets the date directory
+        homes_dir = os.path.dirname(currents_dir)       # Gets the home directory (niagara_ltc)
+        base_dir = os.path.dirname(homes_dir)          # Gets the 'analyzed' directory
+
+        # Construct the path to the processed_incidents.csv
+        date_dir = f"{year}_{month}_{day}"
+        processed_incidents_path = os.path.join(
+            base_dir,
+            home_unit,
+            date_dir,
+            f"{base_filename}_processed_incidents.csv"
+        )
+        
+        # Check if processed_incidents.csv exists
+        if not os.path.exists(processed_incidents_path):
+            logging.warning(f"Processed incidents file not found: {processed_incidents_path}")
+            return
+            
+        # Read the processed incidents file
+        processed_df = pd.read_csv(processed_incidents_path)
+        
+        # Convert 'Effective Date' to datetime 
+        df['Parsed_Date'] = pd.to_datetime(df['Effective Date'], format='%m/%d/%Y %H:%M')
+        processed_df['date'] = pd.to_datetime(processed_df['date'])
+        
+        # Filter only 'Incident - Falls' type notes
+        falls_df = df[df['Type'] == 'Incident - Falls'].copy()
+        
+        # Group by date (just the date part) and resident name
+        falls_grouped = falls_df.groupby([falls_df['Parsed_Date'].dt.date, 'Resident Name'])
+        
+        rows_to_drop = []
+        
+        # For each group of falls on the same day for the same resident
+        for (date, resident), group in falls_grouped:
+            if len(group) > 1:  # If there are multiple falls recorded
+                # Count actual falls in processed_incidents for this resident on this date
+                actual_falls = len(processed_df[
+                    (processed_df['date'].dt.date == date) & 
+                    (processed_df['name'] == resident)
+                ])
+                
+                if actual_falls == 0:
+                    # If no falls recorded in processed_incidents, keep only the first entry
+                    rows_to_drop.extend(group.iloc[1:].index.tolist())
+                elif len(group) > actual_falls:
+                    # If we have more fall notes than actual falls, keep only the first 'actual_falls' entries
+                    # Sort by timestamp to keep the earliest entries
+                    sorted_group = group.sort_values('Parsed_Date')
+                    rows_to_drop.extend(sorted_group.iloc[actual_falls:].index.tolist())
+        
+        if rows_to_drop:
+            # Drop the identified duplicate rows from the original dataframe
+            df = df.drop(rows_to_drop)
+            
+            df.drop(columns=['Parsed_Date'], axis=1, inplace=True)
+            
+            print(f"Removed {len(rows_to_drop)} excess Incident - Falls entries")
+            logging.info(f"Removed {len(rows_to_drop)} excess Incident - Falls entries")
+            return df
+        else:
+            print("No excess Incident - Falls entries found")
+            logging.info("No excess Incident - Falls entries found")
+        
+    except Exception as e:
+        logging.error(f"Error searching and removing duplicate falls: {str(e)}")
+        print(f"Error searching and removing duplicate falls: {str(e)}")
+
+def add_previous_day_injuries(df, csv_file="behaviour_incidents.csv", profile: HomeProfile = None):
+    """
+    Add a 'previous_injuries' column by matching rows from the previous day's CSV
+    exactly matching the effective date and time.
+    
+    Args:
+        df (pd.DataFrame): Notes from the previous stage
+        csv_file (str): Path to the current day's CSV file
+    """
+    try:
+        # Get the full path of the current CSV file
+        full_csv_path = os.path.abspath(csv_file)
+        
+        # Parse the current file path components
+        current_dir = os.path.dirname(full_csv_path)  # Gets the date directory
+        home_dir = os.path.dirname(current_dir)       # Gets the home directory (niagara_ltc)
+        base_dir = os.path.dirname(home_dir)          # Gets the 'analyzed' directory
+        
+        # Get home name from the home directory
+        home_name = os.path.basename(home_dir)
+        
+        # Extract date from the current directory name (format: YYYY_MM_DD)
+        current_date_dir = os.path.basename(current_dir)
+        year, month, day = current_date_dir.split('_')
+        
+        # Calculate previous day's date
+        current_date = datetime.strptime(f"{year}-{month}-{day}", "%Y-%m-%d")
+        prev_date = current_date - timedelta(days=1)
+        
+        # Format previous day's directory name
+        prev_date_dir = prev_date.strftime("%Y_%m_%d")
+        
+        # Construct the previous day's directory path including home name
+        prev_dir = os.path.join(base_dir, home_name, prev_date_dir)
+        
+        # Get the base filename without the timestamp and _behaviour_incidents.csv
+        current_filename = os.path.basename(full_csv_path)
+
+        # Find the matching home name from homes_dict by checking each key
+        base_name = None
+        for home_key in homes_dict.keys():
+            if current_filename.startswith(home_key):
+                base_name = home_key
+                break
+                
+        if not base_name:
+            logging.error(f"Could not determine home name from filename: {current_filename}")
+            return
+        
+        # Create the pattern for the previous day's file
+        prev_date_pattern = prev_date.strftime("%m-%d-%Y")
+        prev_file_pattern = f"{base_name}_{prev_date_pattern}_*_behaviour_incidents.csv"
+        
+        # Search for matching files in the previous day's directory
+        prev_file_path = os.path.join(prev_dir, prev_file_pattern)
+        matching_files = glob.glob(prev_file_path)
+        
+        if not matching_files:
+            logging.warning(f"No previous day's CSV file found matching pattern: {prev_file_path}")
+            return
+            
+        # Use the first matching file
+        previous_csv_path = matching_files[0]
+        
+        current_df = df
+        # Read the previous day's CSV
+        previous_df = pd.read_csv(previous_csv_path)
+        
+        # Convert Effective Date to datetime for both dataframes
+        current_df['Parsed_Date'] = pd.to_datetime(current_df['Effective Date'], format='%m/%d/%Y %H:%M')
+        previous_df['Parsed_Date'] = pd.to_datetime(previous_df['Effective Date'], format='%m/%d/%Y %H:%M')
+        
+        def find_exact_previous_injuries(row):
+            # Find EXACT matches in the previous day's data, matching both date and time
+            matches = previous_df[
+                (previous_df['Parsed_Date'] == row['Parsed_Date']) & 
+                (previous_df['Resident Name'] == row['Resident Name'])
+            ]
+            
+            # If matches exist, concatenate all their injuries
+            if not matches.empty:
+                unique_injuries = set()
+                for injuries in matches['Injuries']:
+                    # Split and add non-empty
+                    if pd.notna(injuries):
+                        unique_injuries.update(inj.strip() for inj in str(injuries).split(','))
+                # Check for head injury specifically
+                head_injury_exists = any('Head Injury' in str(injuries) for injuries in matches['Injuries'])
+                
+                # Ensure head injury is added if it exists
+                if head_injury_exists:
+                    unique_injuries.add('Head Injury')
+                
+                return ', '.join(unique_injuries) if unique_injuries else 'No Previous Injuries'
+            
+            return 'No Previous Injuries'
+        
+        # Add previous injuries column
+        current_df['Previous_Injuries'] = current_df.apply(find_exact_previous_injuries, axis=1)
+        
+        # Drop the temporary parsed date column
+        current_df = current_df.drop(columns=['Parsed_Date'], errors='ignore')
+        
+        logging.info(f"Added previous day's exact injuries to {full_csv_path} from {previous_csv_path}")
+        print(f"Added previous day's exact injuries from {previous_csv_path}")
+        return current_df
+        
+    except Exception as e:
+        logging.error(f"Error adding previous day's exact injuries: {str(e)}")
+        print(f"Error adding previous day's exact injuries: {str(e)}")
+
+# Enrichment stages, in order. Each takes the notes DataFrame, the output CSV path
+# (used to locate the previous day's and processed incidents files) and the home
+# profile, and returns the updated DataFrame, or None to leave it unchanged.
+ENRICHMENT_STAGES = [
+    csvLook,
+    csvRemoveHeader,
+    filter_behaviour_note_data,
+    add_previous_day_injuries,
+    add_injuries_column,
+    clean_injury_list,
+    add_head_injury_column,
+    searchFalls,
+]
+
+def process_entries(entries, output_csv, profile: HomeProfile, stages=ENRICHMENT_STAGES):
+    """
+    Run the extracted entries through the enrichment stages in memory and write
+    output_csv once at the end.
+
+    Each stage gets its own copy of the DataFrame, so a stage that fails part way
+    leaves the notes as the previous stage produced them. With PDF_PIPELINE_DEBUG=1
+    the output of every stage is also dumped next to output_csv as
+    <name>.<NN>_<stage>.csv.
+    """
+    if not entries:
+        logging.warning("No entries found to save")
+        return
+    debug = os.getenv("PDF_PIPELINE_DEBUG", "0") == "1"
+    df = pd.DataFrame(entries)
+    for i, stage in enumerate(stages, 1):
+        result = stage(df.copy(), output_csv, profile)
+        if result is not None:
+            df = result
+        if debug:
+            df.to_csv(f"{os.path.splitext(output_csv)[0]}.{i:02d}_{stage.__name__}.csv", index=False)
+    save_to_csv(df, output_csv)
+
+def extract_info_from_filename(filename):
+    match = re.search(r'(?P<dashboard>[\w_]+)_(?P<month>\d{2})-(?P<day>\d{2})-(?P<year>\d{4})', filename)
+    if match:
+        dashboard = homes_dict.get(match.group('dashboard'), 'unknown')  
+        year = match.group('year')
+        month = match.group('month')
+        day = match.group('day')
+        return dashboard, year, month, day
+    return None, None, None, None
+
+def main(profile, argv=None, home_dir=None):
+    """
+    Parse every PDF in <home_dir>/downloads into <home_dir>/analyzed/<home>/<date>/.
+
+    profile is a home folder name or HomeProfile; home_dir defaults to its folder.
+    """
+    global client
+    profile = get_profile(profile)
+    home_dir = home_dir or profile.directory
+    argparse.ArgumentParser(description="Extract behaviour notes from the downloaded PDF reports.").parse_args(argv)
+
+    openai_api_key = os.getenv("OPENAI_API_KEY")
+    if not openai_api_key:
+        raise ValueError("OPENAI_API_KEY not found in .env file")
+    client = get_llm_client(openai_api_key)
+
+    pdf_files = glob.glob(os.path.join(home_dir, "downloads", "*.pdf"))
+
+    if not pdf_files:
+        logging.error("No PDF files found in the downloads directory.")
+        return
+
+    # Create the analyzed directory if it doesn't exist
+    analyzed_dir = os.path.join(os.path.abspath(home_dir), "analyzed")
+    if not os.path.exists(analyzed_dir):
+        os.makedirs(analyzed_dir)
+
+    for pdf_path in pdf_files:
+        logging.info(f"Starting PDF parsing process for: {pdf_path}")
+        
+        # Determine the home folder from the profile or the PDF file name (before extracting, so a PDF
+        # whose output has nowhere to go is not parsed)
+        home_name = profile.analyzed_home(pdf_path)
+        if not home_name:
+            logging.error(f"Home name not found in PDF file: {pdf_path}")
+            continue
+        
+        # Extract date information from the filename
+        _, year, month, day = extract_info_from_filename(os.path.basename(pdf_path))
+        if not (year and month and day):
+            logging.error(f"Date information not found in PDF file: {pdf_path}")
+            continue
+        
+        # Pages stream straight from extraction into the note segmenter. The notes are collected
+        # here because the enrichment stages work on the whole DataFrame (previous-day injuries,
+        # fall counts), so only extraction and segmentation stream.
+        pages = iter_text_from_pdf(pdf_path, profile.pdf_max_pages, tolerance=profile.pdf_tolerance)
+        try:
+            firstPage = next(pages, None)
+            if firstPage is None:
+                logging.error(f"Failed to extract text from PDF: {pdf_path}")
+                continue
+            entries = list(iterFallNotes(chain([firstPage], pages), profile))
+        except Exception as e:
+            logging.error(f"Error extracting text from PDF: {str(e)}")
+            logging.error(f"Failed to extract text from PDF: {pdf_path}")
+            continue
+        
+        date_dir = os.path.join(analyzed_dir, home_name, f"{year}_{month}_{day}")
+        if not os.path.exists(date_dir):
+            os.makedirs(date_dir)
+        
+        # Save the CSV in the date-specific subdirectory
+        output_csv = os.path.join(date_dir, f"{os.path.splitext(os.path.basename(pdf_path))[0]}_behaviour_incidents.csv")
+        process_entries(entries, output_csv, profile)
+    
+    log_cache_stats()
+    logging.info("Process completed")
@@ -1,7 +1,10 @@
 #central place for the retirement homes to simplify the whole process
 from datetime import datetime
 
-homes = ["INA GRAFTON GAGE", "NIAGARA LTC", "THE WELLINGTON", "MILL CREEK CARE", "BON AIR", "CHAMPLAIN LTC", "LANCASTER LTC", "THE ONEILL", "VILLA MARCONI", "GENERATIONS", "SRR", "SHEPHERD LODGE", "BERKSHIRE CARE", "BANWELL GARDENS"]
+import numpy as np
+import pandas as pd
+
+homes = ["INA GRAFTON GAGE", "NIAGARA LTC", "THE WELLINGTON", "MILL CREEK CARE", "BON AIR", "CHAMPLAIN LTC", "LANCASTER LTC", "THE ONEILL", "VILLA MARCONI", "GENERATIONS", "SRR", "SHEPHERD LODGE", "BERKSHIRE CARE", "BANWELL GARDENS", "TEST"]
 
 homes_email = {
     "Ina Grafton": ["ayaan@fallyx.com"],
@@ -15,7 +18,8 @@ homes_email = {
     "Villa Marconi": ["ayaanesmail04@gmail.com"],
     "SRR": ["ayaanesmail04@gmail.com"],
     "Berkshire Care": ["ayaanesmail04@gmail.com"],
-    "Banwell Gardens": ["ayaanesmail04@gmail.com"]
+    "Banwell Gardens": ["ayaanesmail04@gmail.com"],
+    "Test": ["ayaan@fallyx.com"]
 }
 #firebase related
 association_dict = {
@@ -29,9 +33,11 @@ association_dict = {
     'oneill': 'the_oneill',
     'vmltc': 'villa_marconi',
     'scarborough_retirement': 'srr',
+    'sl': 'shepherd_lodge',
     'shepherd': 'shepherd_lodge',
     'berkshire': 'berkshire_care',
     'banwell': 'banwell_gardens',
+    'test': 'test',
 }
 homes_dict = {
     'ina_grafton_gage': 'iggh',
@@ -48,6 +54,7 @@ homes_dict = {
     'shepherd_lodge': 'shepherd',
     'berkshire_care': 'berkshire',
     'banwell_gardens': 'banwell',
+    'test': 'test',
 }
 
 naming_dict = {
@@ -64,9 +71,9 @@ naming_dict = {
     'shepherd_lodge': 'shepherd',
     'berkshire_care': 'Berkshire Care',
     'banwell_gardens': 'Banwell Gardens',
-
+    'test': 'Test',
 }
-homes_firebase = ["iggh", "niagara", "wellington", "millCreek", "bonairltc", "champlain", "lancaster", "oneill", "vmltc", "shepherd", "berkshire", "banwell"]
+homes_firebase = ["iggh", "niagara", "wellington", "millCreek", "bonairltc", "champlain", "lancaster", "oneill", "vmltc", "shepherd", "berkshire", "banwell", "test"]
 
 
 
@@ -77,7 +84,7 @@ shift_times = {
         "Night": "23:01 to 06:59"
     },
     "Mill Creek": {
-        "Morning": "06:30 to 14:30",
+        "Morning": "06:31 to 14:30",
         "Evening": "14:31 to 22:30",
         "Night": "22:31 to 06:30"
     },
@@ -87,27 +94,32 @@ shift_times = {
         "Night": "22:01 to 05:59"
     },
     "Wellington": {
-        "Morning": "06:30 to 14:30",
+        "Morning": "06:31 to 14:30",
         "Evening": "14:31 to 22:30",
         "Night": "22:31 to 06:30"
     },
     "The ONeill": {
-        "Morning": "07:00 to 15:00",
+        "Morning": "07:01 to 15:00",
         "Evening": "15:01 to 23:00",
         "Night": "23:01 to 07:00"
     },
     "Lancaster": {
-        "Morning": "06:00 to 14:00",
+        "Morning": "06:01 to 14:00",
         "Evening": "14:01 to 22:00",
         "Night": "22:01 to 06:00"
     },
     "Champlain": {
-        "Morning": "06:00 to 14:00",
+        "Morning": "06:01 to 14:00",
         "Evening": "14:01 to 22:00",
         "Night": "22:01 to 06:00"
     },
     "Villa Marconi": {
-        "Morning": "07:00 to 15:00",
+        "Morning": "07:01 to 15:00",
+        "Evening": "15:01 to 23:00",
+        "Night": "23:01 to 07:00"
+    },
+    "sl": {
+        "Morning": "07:01 to 15:00",
         "Evening": "15:01 to 23:00",
         "Night": "23:01 to 07:00"
     },
@@ -120,27 +132,70 @@ shift_times = {
         "Morning": "07:00 to 15:00",
         "Evening": "15:01 to 23:00",
         "Night": "23:01 to 07:00"
+    },
+    "Test": {
+        "Morning": "07:00 to 15:00",
+        "Evening": "15:01 to 23:00",
+        "Night": "23:01 to 06:59"
     }
 }
 
 
+SHIFT_NOT_FOUND = "Time not in any shift"
+MINUTES_PER_DAY = 24 * 60
+
+def minute_of_day(time_str):
+    hours, minutes = time_str.strip().split(":")
+    return int(hours) * 60 + int(minutes)
+
+def build_shift_table(shifts):
+    """Shift name for every minute of the day (index 0 is 00:00); where ranges overlap the shift listed first wins."""
+    minutes = np.arange(MINUTES_PER_DAY)
+    table = np.full(MINUTES_PER_DAY, SHIFT_NOT_FOUND, dtype=object)
+    assigned = np.zeros(MINUTES_PER_DAY, dtype=bool)
+    for shift, time_range in shifts.items():
+        start, end = (minute_of_day(part) for part in time_range.split(" to "))
+        # Handle overnight shifts
+        if start <= end:
+            in_shift = (minutes >= start) & (minutes <= end)
+        else:
+            in_shift = (minutes >= start) | (minutes <= end)
+        table[in_shift & ~assigned] = shift
+        assigned |= in_shift
+    return table
+
+# home -> shift for each minute of the day, built once from shift_times
+shift_tables = {home: build_shift_table(shifts) for home, shifts in shift_times.items()}
+
 def get_shift_time(home, input_time):
     # Convert input_time to a datetime object
     input_time = datetime.strptime(input_time.strip(), "%H:%M")
     
     # Check if the home exists in the shift_times dictionary
-    if home in shift_times:
-        for shift, time_range in shift_times[home].items():
-            start_time_str, end_time_str = time_range.split(" to ")
-            start_time = datetime.strptime(start_time_str, "%H:%M")
-            end_time = datetime.strptime(end_time_str, "%H:%M")
-            
-            # Handle overnight shifts
-            if start_time <= end_time:
-                if start_time <= input_time <= end_time:
-                    return shift
-            else:
-                if input_time >= start_time or input_time <= end_time:
-                    return shift
-    return "Time not in any shift"
+    if home in shift_tables:
+        return shift_tables[home][input_time.hour * 60 + input_time.minute]
+    return SHIFT_NOT_FOUND
+
+def assign_shifts(home, times):
+    """
+    get_shift_time over a whole column: times are "HH:MM" / "HH:MM:SS" strings
+    (the time column of the processed CSVs) or datetimes. Returns a Series of
+    shift names with the same index; times that cannot be read, or homes
+    without shift_times, get SHIFT_NOT_FOUND.
+    """
+    times = pd.Series(times)
+    if pd.api.types.is_datetime64_any_dtype(times):
+        hours, minutes = times.dt.hour.to_numpy(), times.dt.minute.to_numpy()
+    else:
+        # a month of incidents repeats the same few hundred times, so each distinct string is parsed once;
+        # missing times (None/NaN) get code -1, which picks the NaN appended after the distinct times
+        codes, distinct = pd.factorize(times.astype(str))
+        parts = pd.Series(distinct, dtype=object).str.extract(r"^\s*(\d{1,2}):(\d{2})(?::\d{2})?\s*$")
+        hours = np.append(pd.to_numeric(parts[0]).to_numpy(dtype=float), np.nan)[codes]
+        minutes = np.append(pd.to_numeric(parts[1]).to_numpy(dtype=float), np.nan)[codes]
+    valid = (hours < 24) & (minutes < 60)
 
+    shifts = np.full(len(times), SHIFT_NOT_FOUND, dtype=object)
+    if home in shift_tables:
+        shifts[valid] = shift_tables[home][(hours[valid] * 60 + minutes[valid]).astype(int)]
+    return pd.Series(shifts, index=times.index)
@@ -0,0 +1,127 @@
+#persistent cache of model answers so notes repeated in the month-to-date reports are only sent once
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+# shared by every home: answers are keyed by the prompt and note text, not by home
+CACHE_DIR = os.getenv("LLM_CACHE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache"))
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+
+_cache = None
+
+def normalize_text(text) -> str:
+    """Collapse whitespace so re-indented prompts and re-wrapped note text hash the same."""
+    return re.sub(r"\s+", " ", str(text)).strip()
+
+def cache_key(template: str, params: dict) -> str:
+    """
+    Hash of the prompt template version, model, normalized messages and the
+    remaining request parameters (temperature, max_tokens, ...).
+    """
+    payload = {
+        "template": template,
+        "model": params.get("model"),
+        "messages": [
+            {"role": message.get("role"), "content": normalize_text(message.get("content", ""))}
+            for message in params.get("messages", [])
+        ],
+        "params": {k: v for k, v in params.items() if k not in ("model", "messages")},
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+class LLMCache:
+    """
+    SQLite store of model answers keyed by cache_key().
+
+    Template names carry their version (e.g. "summary:v1"); bump the version
+    when a prompt changes, or drop the old answers with invalidate().
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        os.makedirs(cache_dir, exist_ok=True)
+        # the client looks answers up from its event loop thread
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(cache_dir, "llm_cache.sqlite"), timeout=30, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                template TEXT NOT NULL,
+                model TEXT,
+                response TEXT NOT NULL,
+                created REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS responses_template ON responses(template);
+        """)
+        self.counters = {}
+
+    def _count(self, template: str, hit: bool):
+        hits, misses = self.counters.get(template, (0, 0))
+        self.counters[template] = (hits + 1, misses) if hit else (hits, misses + 1)
+
+    def get(self, key: str, template: str):
+        """Cached answer for key, or None."""
+        with self.lock:
+            row = self.conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row:
+                self.conn.execute("UPDATE responses SET hits = hits + 1 WHERE key = ?", (key,))
+                self.conn.commit()
+            self._count(template, row is not None)
+        return row[0] if row else None
+
+    def put(self, key: str, template: str, model: str, response: str):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, template, model, response, created) VALUES (?, ?, ?, ?, ?)",
+                (key, template, model, response, time.time())
+            )
+            self.conn.commit()
+
+    def invalidate(self, template: str) -> int:
+        """Delete every answer stored for one template version; returns the number removed."""
+        with self.lock:
+            deleted = self.conn.execute("DELETE FROM responses WHERE template = ?", (template,)).rowcount
+            self.conn.commit()
+        logging.info(f"LLM cache: invalidated {deleted} answers for {template}")
+        return deleted
+
+    def stats(self) -> dict:
+        """{template: {"stored": n, "hits": session hits, "misses": session misses}}"""
+        with self.lock:
+            stored = dict(self.conn.execute("SELECT template, COUNT(*) FROM responses GROUP BY template").fetchall())
+        stats = {}
+        for template in sorted(set(stored) | set(self.counters)):
+            hits, misses = self.counters.get(template, (0, 0))
+            stats[template] = {"stored": stored.get(template, 0), "hits": hits, "misses": misses}
+        return stats
+
+    def log_stats(self):
+        for template, counts in self.stats().items():
+            if counts["hits"] or counts["misses"]:
+                logging.info(f"LLM cache {template}: {counts['hits']} hits, {counts['misses']} misses")
+                print(f"LLM cache {template}: {counts['hits']} hits, {counts['misses']} misses")
+
+def get_llm_cache():
+    """Shared cache instance, or None when disabled with LLM_CACHE_ENABLED=0."""
+    global _cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = LLMCache()
+    return _cache
+
+if __name__ == "__main__":
+    # python3 -m engine.llm_cache                       -> stored answers per template version
+    # python3 -m engine.llm_cache invalidate summary:v1 -> drop one template version
+    cache = LLMCache()
+    if len(sys.argv) == 3 and sys.argv[1] == "invalidate":
+        print(f"Removed {cache.invalidate(sys.argv[2])} cached answers for {sys.argv[2]}")
+    else:
+        for template, counts in cache.stats().items():
+            print(f"{template}: {counts['stored']} stored")
@@ -0,0 +1,231 @@
+#shared async openai client so notes can be sent to the model in parallel instead of one row at a time
+import asyncio
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+import openai
+import pandas as pd
+
+from .llm_cache import cache_key, get_llm_cache
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "500"))
+LLM_TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", "160000"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+# complete_batch packs up to this many items into one request (1 disables batching)
+LLM_BATCH_MAX_ITEMS = int(os.getenv("LLM_BATCH_MAX_ITEMS", "20"))
+# estimated prompt tokens per batch, so a few long notes don't overflow the context window
+LLM_BATCH_TOKEN_BUDGET = int(os.getenv("LLM_BATCH_TOKEN_BUDGET", "3000"))
+
+# errors worth retrying; anything else (bad request, auth) is raised to the caller straight away
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+)
+
+_clients = {}
+
+class TokenBucket:
+    """
+    Refills at `per_minute` units per minute up to a full minute's worth.
+    acquire(n) waits until n units are available and takes them.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.available = per_minute
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self, amount: float = 1):
+        # a single request larger than the bucket still has to go through eventually
+        amount = min(amount, self.capacity)
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.available >= amount:
+                    self.available -= amount
+                    return
+                await asyncio.sleep((amount - self.available) / self.rate)
+
+def estimate_tokens(messages: list, max_tokens: int = 0) -> int:
+    """Rough token count for rate limiting (~4 characters per token plus the completion budget)."""
+    return sum(len(str(message.get("content", ""))) for message in messages) // 4 + (max_tokens or 0)
+
+def pack_batches(texts: list, token_budget: int = LLM_BATCH_TOKEN_BUDGET, max_items: int = LLM_BATCH_MAX_ITEMS) -> list:
+    """
+    Split item indices into consecutive batches whose estimated size stays under
+    token_budget and that hold at most max_items each. An item larger than the
+    budget gets a batch of its own.
+    """
+    batches = []
+    current, current_tokens = [], 0
+    for i, text in enumerate(texts):
+        item_tokens = len(str(text)) // 4 + 10  # + id and separators
+        if current and (len(current) >= max_items or current_tokens + item_tokens > token_budget):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += item_tokens
+    if current:
+        batches.append(current)
+    return batches
+
+class LLMClient:
+    """
+    Async chat completions with bounded concurrency, request and token per-minute
+    limits, and retries with jittered exponential backoff.
+
+    The client runs its own event loop on a background thread, so the synchronous
+    pipeline code can hand it a batch of coroutines with gather()/apply() and get
+    the results back in the order they were given.
+
+    complete() answers from the persistent LLM cache (llm_cache.py) when the same
+    prompt template version has already been sent with the same input.
+    """
+
+    def __init__(self, api_key: str = None, max_concurrency: int = LLM_MAX_CONCURRENCY,
+                 requests_per_minute: float = LLM_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = LLM_TOKENS_PER_MINUTE, max_retries: int = LLM_MAX_RETRIES,
+                 use_cache: bool = True):
+        self.max_retries = max_retries
+        self.cache = get_llm_cache() if use_cache else None
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, name="llm-client", daemon=True).start()
+        self.client = openai.AsyncOpenAI(api_key=api_key)
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+    async def chat(self, **kwargs):
+        """Same arguments as client.chat.completions.create; returns the completion."""
+        token_estimate = estimate_tokens(kwargs.get("messages", []), kwargs.get("max_tokens"))
+        for attempt in range(self.max_retries + 1):
+            await self.requests.acquire(1)
+            await self.tokens.acquire(token_estimate)
+            try:
+                async with self.semaphore:
+                    return await self.client.chat.completions.create(**kwargs)
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = min(60, 2 ** attempt) * random.uniform(0.5, 1.5)
+                logging.warning(f"OpenAI call failed ({type(e).__name__}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def complete(self, template: str, **kwargs) -> str:
+        """
+        Message content of a chat completion. template names the prompt and its
+        version (e.g. "summary:v1") and is part of the cache key.
+        """
+        key = cache_key(template, kwargs) if self.cache is not None else None
+        if key is not None:
+            cached = self.cache.get(key, template)
+            if cached is not None:
+                return cached
+        response = await self.chat(**kwargs)
+        content = response.choices[0].message.content
+        if key is not None and content is not None:
+            self.cache.put(key, template, kwargs.get("model"), content)
+        return content
+
+    async def complete_batch(self, template: str, instructions: str, items: list, system: str,
+                             model: str = "gpt-3.5-turbo", answer_tokens: int = 10, temperature: float = 0.0) -> list:
+        """
+        Answer many short items with as few requests as possible.
+
+        Items are packed into token-budgeted batches, each sent as one prompt with
+        numbered ids and answered as a JSON object keyed by id. Returns one answer
+        string per item, in order, or None where an item could not be answered
+        (bad JSON, missing id, failed request) so the caller can fall back to its
+        single-item prompt. Answers are cached per item, so a note that shows up
+        in a different batch tomorrow is still a cache hit.
+        """
+        answers = [None] * len(items)
+        item_template = f"{template}:item"
+        keys = [None] * len(items)
+        pending = []
+        for i, item in enumerate(items):
+            if self.cache is not None:
+                keys[i] = cache_key(item_template, {
+                    "model": model,
+                    "messages": [{"role": "system", "content": system}, {"role": "user", "content": f"{instructions}\n{item}"}],
+                })
+                answers[i] = self.cache.get(keys[i], item_template)
+            if answers[i] is None:
+                pending.append(i)
+        if LLM_BATCH_MAX_ITEMS <= 1 or not pending:
+            return answers
+
+        async def run_batch(batch):
+            ids = {str(n): i for n, i in enumerate(batch, 1)}
+            prompt = (
+                f"{instructions}\n\n"
+                "Each item below starts with its id in square brackets.\n\n"
+                + "\n\n".join(f"[{item_id}]\n{items[i]}" for item_id, i in ids.items())
+                + "\n\nRespond with a JSON object that maps every id to its answer, e.g. {\"1\": \"...\", \"2\": \"...\"}."
+            )
+            try:
+                response = await self.chat(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": system},
+                        {"role": "user", "content": prompt}
+                    ],
+                    response_format={"type": "json_object"},
+                    temperature=temperature,
+                    max_tokens=answer_tokens * len(batch) + 20
+                )
+                parsed = json.loads(response.choices[0].message.content)
+            except Exception as e:
+                logging.warning(f"Batch of {len(batch)} items for {template} failed ({type(e).__name__}), using single calls")
+                return
+            if not isinstance(parsed, dict):
+                return
+            for item_id, i in ids.items():
+                value = parsed.get(item_id)
+                if isinstance(value, (str, int, float, bool)) and str(value).strip():
+                    answers[i] = str(value).strip()
+                    if keys[i] is not None:
+                        self.cache.put(keys[i], item_template, model, answers[i])
+
+        batches = pack_batches([items[i] for i in pending])
+        await asyncio.gather(*[run_batch([pending[j] for j in batch]) for batch in batches])
+        return answers
+
+    def run(self, coro):
+        """Run a coroutine on the client's loop and block until it finishes."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def gather(self, coros) -> list:
+        """Run coroutines concurrently; results come back in the same order."""
+        async def gather_all():
+            return list(await asyncio.gather(*coros))
+        return self.run(gather_all())
+
+    def apply(self, df: pd.DataFrame, func) -> pd.Series:
+        """Like df.apply(func, axis=1) for an async row function, with rows processed concurrently."""
+        results = self.gather([func(row) for _, row in df.iterrows()])
+        return pd.Series(results, index=df.index, dtype=object)
+
+def log_cache_stats():
+    """Log LLM cache hits and misses for this run."""
+    cache = get_llm_cache()
+    if cache is not None:
+        cache.log_stats()
+
+def get_llm_client(api_key: str = None) -> LLMClient:
+    """Shared client per API key (defaults to OPENAI_API_KEY)."""
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if api_key not in _clients:
+        _clients[api_key] = LLMClient(api_key)
+    return _clients[api_key]
@@ -0,0 +1,102 @@
+#records what each pipeline stage has already processed so daily runs only touch new or changed days
+import argparse
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+
+MANIFEST_FILE = "manifest.json"
+
+def hash_file(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of the raw file bytes, or None if the file does not exist."""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def day_of(path: str):
+    """Date of the YYYY_MM_DD day directory in path, or None."""
+    match = re.search(r"(\d{4})_(\d{2})_(\d{2})", path)
+    if not match:
+        return None
+    return datetime.strptime("-".join(match.groups()), "%Y-%m-%d").date()
+
+def parse_since(value: str):
+    """Accepts YYYY-MM-DD or YYYY_MM_DD."""
+    return datetime.strptime(value.replace("_", "-"), "%Y-%m-%d").date()
+
+def add_manifest_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--force", action="store_true", help="reprocess everything, ignoring the manifest")
+    parser.add_argument("--since", type=parse_since, help="reprocess day directories on or after this date (YYYY-MM-DD)")
+
+class Manifest:
+    """
+    JSON manifest kept in the analyzed folder.
+
+    For every stage and unit of work (keyed by its main input file relative to
+    the analyzed folder, which places it in a day directory) it stores the input
+    and output hashes and when the stage completed. A unit is skipped when it
+    completed before, its inputs hash the same and the outputs it wrote still
+    exist (an output it did not write, e.g. no follow-up notes that day, is not
+    expected).
+    """
+
+    def __init__(self, base_directory: str = "analyzed", force: bool = False, since=None):
+        self.base_directory = base_directory
+        self.path = os.path.join(base_directory, MANIFEST_FILE)
+        self.force = force
+        self.since = since
+        self.data = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.data = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable manifest {self.path}: {e}")
+
+    @classmethod
+    def from_args(cls, base_directory: str, args):
+        return cls(base_directory, force=args.force, since=args.since)
+
+    def _key(self, path: str) -> str:
+        return os.path.relpath(path, self.base_directory).replace(os.sep, "/")
+
+    def _hashes(self, paths) -> dict:
+        return {self._key(path): hash_file(path) for path in paths}
+
+    def is_current(self, stage: str, inputs: list, outputs: list = ()) -> bool:
+        """True if this stage already processed exactly these inputs and the outputs it wrote are still there."""
+        if self.force:
+            return False
+        day = day_of(self._key(inputs[0]))
+        if self.since and day and day >= self.since:
+            return False
+        entry = self.data.get(stage, {}).get(self._key(inputs[0]))
+        if not entry or not entry.get("complete"):
+            return False
+        if entry.get("inputs") != self._hashes(inputs):
+            return False
+        written = entry.get("outputs") or {}
+        return all(os.path.exists(path) for path in outputs if written.get(self._key(path)) is not None)
+
+    def record(self, stage: str, inputs: list, outputs: list = ()):
+        """Mark the stage complete for these inputs and save the manifest."""
+        self.data.setdefault(stage, {})[self._key(inputs[0])] = {
+            "day": str(day_of(self._key(inputs[0])) or ""),
+            "inputs": self._hashes(inputs),
+            "outputs": self._hashes(outputs),
+            "complete": True,
+            "completed_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        self.save()
+
+    def save(self):
+        os.makedirs(self.base_directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
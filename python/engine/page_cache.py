@@ -0,0 +1,230 @@
+#on-disk cache of extracted pdf page text so re-runs skip pdfplumber for pages we have already seen
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+
+import pdfplumber
+from pdfminer.pdftypes import PDFObjRef, PDFStream, resolve1
+from pdfminer.psparser import PSLiteral
+
+# shared by every home: pages are keyed by file and page content hashes plus the extraction settings
+CACHE_DIR = os.getenv("PAGE_CACHE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache"))
+CACHE_MAX_MB = float(os.getenv("PAGE_CACHE_MAX_MB", "256"))
+
+_cache = None
+
+def hash_file(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of the raw file bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# bumped when hash_page changes, so pages hashed the old way are not looked up again
+PAGE_HASH_VERSION = 2
+
+# Glyph programs only draw the text and Parent points back up the page tree; pdfminer reads
+# text through the encoding, ToUnicode map and widths, which are hashed
+SKIPPED_KEYS = {"FontFile", "FontFile2", "FontFile3", "Parent"}
+# decoded stream data is hashed, so how it was compressed does not matter
+STREAM_FORMAT_KEYS = {"Length", "Filter", "DecodeParms", "DL"}
+SUBSET_TAG = re.compile(r"^[A-Z]{6}\+")
+
+def _name(value) -> str:
+    name = value.name if isinstance(value, PSLiteral) else value
+    return name.decode("latin-1") if isinstance(name, bytes) else str(name)
+
+def hash_object(obj, memo: dict) -> bytes:
+    """
+    Digest of a PDF object and everything it references (dicts, arrays, decoded
+    streams). memo holds the digests of indirect objects by object id for one
+    document, so fonts and forms shared by many pages are hashed once.
+    """
+    if isinstance(obj, PDFObjRef):
+        if obj.objid not in memo:
+            memo[obj.objid] = b"cycle"  # placeholder while the object is hashed, for reference cycles
+            memo[obj.objid] = hash_object(obj.resolve(), memo)
+        return memo[obj.objid]
+
+    digest = hashlib.sha256()
+    if isinstance(obj, PDFStream):
+        attrs = {key: value for key, value in obj.attrs.items() if key not in STREAM_FORMAT_KEYS}
+        digest.update(b"stream" + hash_object(attrs, memo))
+        # images do not change the extracted text, so only their dictionary is hashed
+        if _name(obj.attrs.get("Subtype", "")) != "Image":
+            digest.update(obj.get_data())
+    elif isinstance(obj, dict):
+        digest.update(b"dict")
+        for key in sorted(obj, key=_name):
+            if _name(key) in SKIPPED_KEYS:
+                continue
+            value = obj[key]
+            if _name(key) == "BaseFont":
+                # the subset tag (ABCDEF+Arial) changes with every export of the same font
+                value = SUBSET_TAG.sub("", _name(resolve1(value)))
+            digest.update(_name(key).encode() + b"=" + hash_object(value, memo))
+    elif isinstance(obj, (list, tuple)):
+        digest.update(b"array")
+        for value in obj:
+            digest.update(hash_object(value, memo))
+    elif isinstance(obj, PSLiteral):
+        digest.update(b"/" + _name(obj).encode())
+    else:
+        digest.update(f"{type(obj).__name__}:{obj!r}".encode())
+    return digest.digest()
+
+def hash_page(page, salt: str = "", memo: dict = None) -> str:
+    """
+    Hash a pdfplumber page by its decoded content streams, page box and resources.
+    This is cheap compared to text extraction (no layout analysis), and identical
+    pages in a report that grew day over day hash to the same value. Resources
+    (fonts with their encodings and ToUnicode maps, form XObjects) are included,
+    so the same content stream drawn with different fonts or forms does not
+    collide; pass the same memo for every page of a document.
+    """
+    memo = {} if memo is None else memo
+    digest = hashlib.sha256(f"{PAGE_HASH_VERSION}:{salt}".encode())
+    digest.update(repr(page.bbox).encode())
+    for stream in page.page_obj.contents or []:
+        digest.update(resolve1(stream).get_data())
+    digest.update(hash_object(page.page_obj.resources or {}, memo))
+    return digest.hexdigest()
+
+class PageTextCache:
+    """
+    SQLite-backed page text store with a size cap and LRU eviction.
+
+    pages: page hash -> extracted text (NULL when the page had no text)
+    files: file hash -> ordered page hashes, so an unchanged PDF is served
+           without opening it at all
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_mb: float = CACHE_MAX_MB):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.conn = sqlite3.connect(os.path.join(cache_dir, "page_text.sqlite"), timeout=30)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS pages (
+                page_hash TEXT PRIMARY KEY,
+                text TEXT,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS files (
+                file_key TEXT PRIMARY KEY,
+                page_hashes TEXT NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS pages_last_used ON pages(last_used);
+        """)
+
+    def get_pages(self, page_hashes: list) -> dict:
+        """Return {page_hash: text} for every hash that is cached, marking them as recently used."""
+        found = {}
+        unique = list(dict.fromkeys(page_hashes))
+        for i in range(0, len(unique), 500):
+            chunk = unique[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(f"SELECT page_hash, text FROM pages WHERE page_hash IN ({placeholders})", chunk)
+            found.update(rows.fetchall())
+            self.conn.execute(f"UPDATE pages SET last_used = ? WHERE page_hash IN ({placeholders})", [time.time()] + chunk)
+        self.conn.commit()
+        return found
+
+    def put_pages(self, texts: dict):
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO pages (page_hash, text, size, last_used) VALUES (?, ?, ?, ?)",
+            [(page_hash, text, len(text.encode()) if text else 0, now) for page_hash, text in texts.items()]
+        )
+        self.conn.commit()
+        self._evict()
+
+    def get_file(self, file_key: str):
+        """Ordered page texts for a previously seen file, or None if unknown or partially evicted."""
+        row = self.conn.execute("SELECT page_hashes FROM files WHERE file_key = ?", (file_key,)).fetchone()
+        if not row:
+            return None
+        page_hashes = json.loads(row[0])
+        texts = self.get_pages(page_hashes)
+        if len(texts) < len(set(page_hashes)):
+            return None
+        self.conn.execute("UPDATE files SET last_used = ? WHERE file_key = ?", (time.time(), file_key))
+        self.conn.commit()
+        return [texts[page_hash] for page_hash in page_hashes]
+
+    def put_file(self, file_key: str, page_hashes: list):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO files (file_key, page_hashes, last_used) VALUES (?, ?, ?)",
+            (file_key, json.dumps(page_hashes), time.time())
+        )
+        self.conn.commit()
+
+    def _evict(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        cutoff = None
+        for page_hash, size, last_used in self.conn.execute("SELECT page_hash, size, last_used FROM pages ORDER BY last_used").fetchall():
+            if total <= self.max_bytes:
+                break
+            self.conn.execute("DELETE FROM pages WHERE page_hash = ?", (page_hash,))
+            total -= size
+            cutoff = last_used
+        if cutoff is not None:
+            # file entries last used before the evicted pages can no longer be served whole
+            self.conn.execute("DELETE FROM files WHERE last_used <= ?", (cutoff,))
+        self.conn.commit()
+        logging.info(f"Page cache evicted down to {total} bytes")
+
+    def iter_pages(self, pdf_path: str, max_pages: int, extract, salt: str = ""):
+        """
+        Yield raw page texts for pdf_path (first max_pages pages) in page order.
+
+        extract(page_numbers) is called only for pages whose content hash is not
+        cached and must yield their texts in the same order; cached pages are
+        yielded without waiting on it.
+        """
+        file_key = f"{hash_file(pdf_path)}:{max_pages}:{salt}:{PAGE_HASH_VERSION}"
+        cached = self.get_file(file_key)
+        if cached is not None:
+            logging.info(f"Page cache hit for all {len(cached)} pages of {pdf_path}")
+            yield from cached
+            return
+
+        with pdfplumber.open(pdf_path) as pdf:
+            memo = {}
+            page_hashes = [hash_page(page, salt, memo) for page in pdf.pages[:max_pages]]
+
+        known = self.get_pages(page_hashes)
+        # first page index of every unseen hash (repeated identical pages are extracted once)
+        first_index = {}
+        for i, page_hash in enumerate(page_hashes):
+            if page_hash not in known:
+                first_index.setdefault(page_hash, i)
+        missing = list(first_index.values())
+        logging.info(f"Page cache: {len(page_hashes) - len(missing)} cached, {len(missing)} to extract for {pdf_path}")
+        extracted = extract(missing) if missing else iter(())
+        new_texts = {}
+        for page_hash in page_hashes:
+            if page_hash not in known:
+                known[page_hash] = new_texts[page_hash] = next(extracted)
+            yield known[page_hash]
+
+        if new_texts:
+            self.put_pages(new_texts)
+        self.put_file(file_key, page_hashes)
+
+def get_page_cache():
+    """Shared cache instance, or None when disabled with PAGE_CACHE_MAX_MB=0."""
+    global _cache
+    if CACHE_MAX_MB <= 0:
+        return None
+    if _cache is None:
+        _cache = PageTextCache()
+    return _cache
@@ -0,0 +1,238 @@
+#what differs between the homes, so every home folder runs the same engine code with its own settings
+import os
+import re
+from dataclasses import dataclass, field, replace
+
+from .homes_db import homes
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+NO_PROGRESS_NOTE = "No Progress Note Found Within 24hrs of RIM Within 24hrs of RIM Within 24hrs of RIM"
+NOT_SPECIFIED = "Not specified in this format"
+
+# Incident - Falls note sections, in the order they appear
+FALL_NOTE_HEADERS = (
+    "Description and Time of Fall :",
+    "History of Falls :",
+    "Resident activity/needs at the time of the fall (i.e. getting in out of bed, chair, in pain etc.) :",
+    "Location of Fall (room,dining room, toilet,shower etc) :",
+    "What foot wear did the resident wear? :",
+    "Physical Status of Resident at time of fall (i.e. pain, dizziness, change in lab values, drop in BS) :",
+    "What mechanical devices were in use (i.e. high low bed, senor etc) :",
+    "Environmental status at time of fall (i.e. w/c locked, room light, call bell accessible, etc.) :",
+    "List any medication changes within the past week :",
+    "Note if resident is on any anticoagulants: :",
+    "Head to Toe Assessment findings: (soft tissue injury, bruising, laceration, hematoma, HIR etc.) :",
+    "Range of Motion and Weight bearing status :",
+    "Fracture (Shortening of limbs & external and/or internal rotation of limbs) :",
+    "Current Status of Resident (is it safe to transfer resident?) :",
+    "Interventions in place to prevent further falls :",
+    "POA aware and response of POA :",
+    "Notify Pharmacist if applicable :",
+    "Physio Referral completed :",
+)
+POST_FALL_HEADERS = ("Data:", "Action:", "Response:")
+DATA_ACTION_RESPONSE_HEADERS = ("Data :", "Action :", "Response :")
+NOTE_TEXT_HEADERS = ("Note Text :",)
+
+# Behaviour - Responsive Behaviour notes (Mill Creek, The O'Neill, Franklin Gardens)
+# field key -> (label in the note, markers that end the field)
+RESPONSIVE_BEHAVIOUR_FIELDS = {
+    'behaviour_type': ('Type of Behaviour :', ('Antecedent/Triggers', 'Page')),
+    'triggers': ('Antecedent/Triggers :', ('Describe the behaviour', 'Page')),
+    'description': ('Describe the behaviour :', ('Disruptiveness', 'Page')),
+    'consequences': ('Disruptiveness (Data)/Consequences to the behaviour :', ('Interventions', 'Page')),
+    'interventions': ('Interventions (review/update care plan) (Action) :', ('Change in medication', 'Page')),
+    'medication_changes': ('Change in medication :', ('What are the risks and causes', 'Page')),
+    'risks': ('What are the risks and causes :', ('Outcome(s)(Result)', 'Page')),
+    'outcome': ('Outcome(s)(Result) :', ('Substitute Decision Maker', 'Page')),
+    'poa_notified': ('Substitute Decision Maker notified (if not, explain) :', ('Page', 'Range')),
+}
+
+# Behaviour Note format (Banwell, Berkshire)
+BEHAVIOUR_NOTE_FIELDS = {
+    'behaviour_displayed': ('Behaviour Displayed :', ('Intervention :', 'Time, Frequency', 'Page')),
+    'intervention': ('Intervention :', ('Time, Frequency', 'Evaluation of Intervention', 'Page')),
+    'time_frequency': ('Time, Frequency and # of Staff :', ('Evaluation of Intervention', 'Resident Response', 'Page')),
+    'evaluation': ('Evaluation of Intervention :', ('Resident Response', 'Page', '________________')),
+    'resident_response': ('Resident Response :', ('Page', '________________', 'SIGNED]')),
+}
+
+# Data / Action / Response notes (Berkshire)
+DATA_ACTION_RESPONSE_FIELDS = {
+    'data': ('Data :', ('Action', 'Page', '________________', 'SIGNED]')),
+    'action': ('Action :', ('Response', 'Page', '________________', 'SIGNED]')),
+    'response': ('Response :', ('Page', '________________', 'SIGNED]')),
+}
+
+@dataclass(frozen=True)
+class HomeProfile:
+    """
+    Settings for one home folder (python/<name>).
+
+    behaviour_columns maps each incident column getBe builds to a template:
+    {key} is replaced by that behaviour_fields value and {type} by the note
+    type; text without placeholders is used as is.
+    """
+
+    name: str
+    # analyzed/ subfolder for every file; None finds the home named in each file name (homes_db.homes)
+    home: str = None
+
+    # getPdfInfo: page text extraction
+    pdf_tolerance: int = 3
+    pdf_max_pages: int = 500
+    # getPdfInfo: which notes are kept
+    note_types: tuple = ()
+    note_type_pattern: str = None     # regex with the type as group 1; defaults to any of note_types
+    note_type_contains: str = None    # keep types containing this text instead of only note_types
+    skip_multi_type_lines: bool = True
+    drop_empty_notes: bool = False
+    # getPdfInfo: csvRemoveHeader cuts each junk marker up to the next section header
+    junk_markers: tuple = ("Facility #",)
+    section_headers: dict = field(default_factory=dict)  # note type -> headers, others use FALL_NOTE_HEADERS
+    late_entry_header: bool = True
+    truncate_behaviour_notes: bool = False  # filter_behaviour_note_data
+
+    # getBe
+    behaviour_note_types: tuple = ()
+    behaviour_fields: dict = field(default_factory=dict)
+    behaviour_columns: dict = field(default_factory=dict)
+    behaviour_match_hours: int = 20
+    summary_fields: tuple = ('behaviour_type', 'description', 'outcome')
+    other_note_types: tuple = ()      # other_notes column; empty leaves the column out
+    followup_note_types: tuple = ()   # _follow.csv; empty skips the file
+    followup_extra_types: tuple = ('Family/Resident Involvment', 'Physician Note')
+
+    # getExcelInfo: group headers over the injury Y/N columns, and whether rooms are mapped to units
+    injury_groups: tuple = ("Injury Noted - During", "Injury Noted - Post")
+    room_to_building: bool = True
+
+    # upload_to_dashboard: file suffix -> node under the home ('' uploads to the home itself)
+    upload_targets: tuple = (("_merged.csv", "behaviours"), ("_follow.csv", "follow"))
+
+    # run_script: run clear_downloads.sh after each run
+    clear_downloads: bool = False
+
+    @property
+    def directory(self) -> str:
+        return os.path.join(PYTHON_DIR, self.name)
+
+    @property
+    def note_type_regex(self):
+        pattern = self.note_type_pattern or r"Type:\s*(" + "|".join(re.escape(t) for t in self.note_types) + ")"
+        return re.compile(pattern)
+
+    def keeps_note_type(self, note_type: str) -> bool:
+        if self.note_type_contains:
+            return self.note_type_contains in note_type
+        return note_type in self.note_types
+
+    def analyzed_home(self, filename: str):
+        """analyzed/ subfolder for an input file, or None if the file name does not name a home."""
+        if self.home:
+            return self.home.replace(" ", "_").replace("-", "_").lower()
+        home_name = next((home for home in homes if home.lower().replace(" ", "_") in os.path.basename(filename).lower()), None)
+        return home_name.replace(" ", "_").replace("-", "_").lower() if home_name else None
+
+ONEILL = HomeProfile(
+    name="oneill",
+    note_types=("Behaviour - Responsive Behaviour", "Family/Resident Involvement", "Physician Note", "Behaviour - Follow up"),
+    section_headers={
+        "Post Fall - Nursing": POST_FALL_HEADERS,
+        "Family/Resident Involvement": DATA_ACTION_RESPONSE_HEADERS,
+        "Physician Note": NOTE_TEXT_HEADERS,
+        "Behaviour - Follow up": NOTE_TEXT_HEADERS,
+    },
+    behaviour_note_types=("Behaviour - Responsive Behaviour",),
+    behaviour_fields=RESPONSIVE_BEHAVIOUR_FIELDS,
+    behaviour_columns={key: "{%s}" % key for key in RESPONSIVE_BEHAVIOUR_FIELDS},
+    other_note_types=("Behaviour - Follow up",),
+    followup_note_types=("Behaviour - Follow up",),
+    clear_downloads=True,
+)
+
+BANWELL = HomeProfile(
+    name="banwell",
+    pdf_tolerance=1,
+    pdf_max_pages=300,
+    note_type_pattern=r"Type:\s*((?:Behaviour Note|Responsive Behaviour)[^,\n]*(?:,\s*Responsive Behaviour[^,\n]*)*)",
+    note_type_contains="Behaviour Note",
+    skip_multi_type_lines=False,
+    section_headers={"Post Fall - Nursing": POST_FALL_HEADERS},
+    truncate_behaviour_notes=True,
+    behaviour_note_types=("Behaviour Note",),
+    behaviour_fields=BEHAVIOUR_NOTE_FIELDS,
+    behaviour_columns={
+        'behaviour_type': "{type}",
+        'triggers': NOT_SPECIFIED,
+        'description': "{behaviour_displayed}",
+        'consequences': NOT_SPECIFIED,
+        'interventions': "{intervention} Evaluation: {evaluation}",
+        'medication_changes': NOT_SPECIFIED,
+        'risks': NOT_SPECIFIED,
+        'outcome': "{resident_response}",
+        'poa_notified': NOT_SPECIFIED,
+        'time_frequency': "{time_frequency}",
+        'evaluation': "{evaluation}",
+    },
+    behaviour_match_hours=24,
+    summary_fields=('behaviour_type', 'description', 'time_frequency'),
+    room_to_building=False,
+    upload_targets=(("_merged.csv", ""),),
+)
+
+BERKSHIRE = HomeProfile(
+    name="berkshire",
+    pdf_tolerance=1,
+    note_types=(
+        "Responsive Behaviour - Physical Agression", "Responsive Behaviour - Verbal",
+        "Responsive Behaviour - Potential to harm self", "Responsive Behaviour - Wandering",
+        "Responsive Behaviours - Other", "Behaviour - Responsive Behaviour", "Family/Resident Involvement",
+        "Physician Note", "Behaviour - Follow up", "Responsive Behaviour Assessment Summary", "Behaviour Note",
+    ),
+    drop_empty_notes=True,
+    junk_markers=("Facility #", "Effective Time Range:"),
+    late_entry_header=False,
+    behaviour_note_types=(
+        "Responsive Behaviour - Physical Agression", "Responsive Behaviour - Verbal",
+        "Responsive Behaviour - Potential to harm self", "Responsive Behaviour - Wandering",
+        "Behaviour - Responsive Behaviour",
+    ),
+    behaviour_fields=DATA_ACTION_RESPONSE_FIELDS,
+    behaviour_columns={
+        'behaviour_type': "{type}",
+        'triggers': NOT_SPECIFIED,
+        'description': "{data}",
+        'consequences': NOT_SPECIFIED,
+        'interventions': "{action} Evaluation: {response}",
+        'medication_changes': NOT_SPECIFIED,
+        'risks': NOT_SPECIFIED,
+        'outcome': "{response}",
+        'poa_notified': NOT_SPECIFIED,
+        'time_frequency': NOT_SPECIFIED,
+        'evaluation': "{response}",
+    },
+    behaviour_match_hours=24,
+    summary_fields=('behaviour_type', 'description', 'time_frequency'),
+    other_note_types=("Behaviour - Follow up", "Behaviour Note"),
+    followup_note_types=("Behaviour - Follow up", "Behaviour Note"),
+    room_to_building=False,
+)
+
+PROFILES = {profile.name: profile for profile in (
+    ONEILL,
+    replace(ONEILL, name="millcreek"),
+    replace(ONEILL, name="franklingardens"),
+    BANWELL,
+    BERKSHIRE,
+    replace(BANWELL, name="test", home="test", upload_targets=(("_merged.csv", "behaviours"),)),
+)}
+
+def get_profile(profile) -> HomeProfile:
+    """The profile for a home folder name (a HomeProfile is returned as is); raises ValueError for unknown homes."""
+    if isinstance(profile, HomeProfile):
+        return profile
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown home: {profile}")
+    return PROFILES[profile]
@@ -0,0 +1,191 @@
+import argparse
+import importlib
+import logging
+import multiprocessing
+import schedule
+import time
+import subprocess
+import traceback
+import re  
+import os  
+from concurrent.futures import ProcessPoolExecutor
+
+from . import STAGE_NAMES
+from .profiles import PROFILES, get_profile
+
+#Function: Run each script in order, on 24/7 basis, for one or more homes
+
+# how often the daemon looks at downloads/ for new reports
+PIPELINE_POLL_SECONDS = int(os.getenv("PIPELINE_POLL_SECONDS", "30"))
+# optional fixed daily run in daemon mode, e.g. "06:00" (empty: only run when downloads arrive)
+PIPELINE_DAILY_AT = os.getenv("PIPELINE_DAILY_AT", "")
+# how many homes run at the same time, each in its own process
+PIPELINE_HOME_WORKERS = int(os.getenv("PIPELINE_HOME_WORKERS", "3"))
+
+STAGES = [(name, importlib.import_module(f"{__package__}.{name}")) for name in STAGE_NAMES]
+
+def extract_info_from_filename(filename):
+    match = re.search(r'(?P<dashboard>[\w_]+)_(?P<month>\d{2})-(?P<day>\d{2})-(?P<year>\d{4})', filename)
+    if match:
+        month_number = match.group('month')
+        day = match.group('day')
+        year = match.group('year')
+        return month_number, day, year
+    return None, None, None
+
+# Create a dictionary of months and their final days
+final_days_of_month = {
+    '01': 31, '02': 28, '03': 31, '04': 30,
+    '05': 31, '06': 30, '07': 31, '08': 31,
+    '09': 30, '10': 31, '11': 30, '12': 31
+}
+
+# Adjust for leap years in February
+def is_leap_year(year):
+    year = int(year)
+    return (year % 4 == 0 and year % 100 != 0) or (year % 400 == 0)
+
+def check_end_of_month(filename):
+    month, day, year = extract_info_from_filename(filename)
+    if month in final_days_of_month:
+        final_day = final_days_of_month[month]
+        if month == '02' and is_leap_year(year):
+            final_day = 29 
+        return int(day) == final_day
+    return False
+
+def run_stage(name, func, *args):
+    # a failing stage is logged and the next one still runs, as with the old separate processes
+    start = time.time()
+    print(f"Running {name}")
+    try:
+        func(*args)
+    except (Exception, SystemExit) as e:
+        logging.error(f"{name} failed: {e}")
+        print(traceback.format_exc())
+        return False
+    print(f"{name} finished in {time.time() - start:.1f}s")
+    return True
+
+def run_daily_scripts(profile, home_dir=None):
+    # stages run in this process back to back, so pandas/openai/firebase are imported once
+    # and the Firebase app and OpenAI client stay initialized between daemon runs
+    for name, module in STAGES:
+        run_stage(f"{name} ({profile.name})", module.main, profile, [], home_dir)
+
+def run_scraping_bot(profile, home_dir=None):
+    home_dir = home_dir or profile.directory
+    run_daily_scripts(profile, home_dir)
+    print(f"All Daily Scripts executed successfully for {profile.name}.")
+
+    if not profile.clear_downloads:
+        return
+
+    # Check if today is the last day of the month
+    downloads_path = os.path.join(home_dir, "downloads")
+    xls_files = [f for f in os.listdir(downloads_path) if f.endswith('.xls')]  
+    if xls_files:
+        filename = os.path.join(downloads_path, xls_files[0]) 
+        month, day, year = extract_info_from_filename(filename)
+        print(f"It's {month}-{day}-{year}.")
+        if check_end_of_month(filename):
+            print("It's the end of the month. Running monthly scripts.")
+            # subprocess.run(["python3", "downloadcsv.py"])  
+            # time.sleep(10)
+            # subprocess.run(["python3", "reportgenerator.py"])
+            # time.sleep(10)
+            # subprocess.run(["python3", "html2pdf.py"])  
+            # time.sleep(10)
+            # subprocess.run(["python3", "emailtohomes.py"])  
+            print("Monthly scripts executed successfully and emails sent.")  
+
+        # Clear downloads after the daily (and monthly) scripts
+        subprocess.run(["/bin/bash", "clear_downloads.sh"], cwd=home_dir)
+
+def downloads_signature(downloads_path="downloads"):
+    # names, sizes and modification times of the files waiting in downloads/
+    if not os.path.isdir(downloads_path):
+        return ()
+    entries = []
+    for name in sorted(os.listdir(downloads_path)):
+        path = os.path.join(downloads_path, name)
+        if os.path.isfile(path) and not name.startswith('.'):
+            stat = os.stat(path)
+            entries.append((name, stat.st_size, stat.st_mtime))
+    return tuple(entries)
+
+class DownloadsWatcher:
+    # tells the daemon when the files in a home's downloads/ are new and have not changed since the last poll
+    def __init__(self, downloads_path="downloads"):
+        self.downloads_path = downloads_path
+        self.last_seen = None
+        self.processed = ()
+
+    def poll(self):
+        current = downloads_signature(self.downloads_path)
+        stable = current == self.last_seen
+        self.last_seen = current
+        if current and stable and current != self.processed:
+            print(f"New files in {self.downloads_path}: {', '.join(name for name, _, _ in current)}")
+            self.processed = current
+            return True
+        return False
+
+    def refresh(self):
+        # after a run, so files the run itself changed are not picked up as new
+        self.last_seen = downloads_signature(self.downloads_path)
+
+def run_pipeline(home):
+    try:
+        run_scraping_bot(get_profile(home))
+    except Exception as e:
+        logging.error(f"Pipeline run failed for {home}: {e}")
+        print(traceback.format_exc())
+
+def home_pool(workers):
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+def run_homes(homes, workers=PIPELINE_HOME_WORKERS, pool=None):
+    """Run the pipeline for each home, up to workers homes at a time (one after another when workers <= 1)."""
+    homes = list(homes)
+    if pool is not None:
+        list(pool.map(run_pipeline, homes))
+    elif workers <= 1 or len(homes) <= 1:
+        for home in homes:
+            run_pipeline(home)
+    else:
+        with home_pool(min(workers, len(homes))) as pool:
+            list(pool.map(run_pipeline, homes))
+
+def run_daemon(homes, workers=PIPELINE_HOME_WORKERS):
+    # one warm pool for the whole daemon; homes whose downloads arrived in the same poll run in parallel
+    pool = home_pool(max(1, min(workers, len(homes)))) if workers > 1 and len(homes) > 1 else None
+    watchers = {home: DownloadsWatcher(os.path.join(get_profile(home).directory, "downloads")) for home in homes}
+
+    def poll():
+        ready = [home for home, watcher in watchers.items() if watcher.poll()]
+        run_homes(ready, workers, pool)
+        for home in ready:
+            watchers[home].refresh()
+
+    schedule.every(PIPELINE_POLL_SECONDS).seconds.do(poll)
+    if PIPELINE_DAILY_AT:
+        schedule.every().day.at(PIPELINE_DAILY_AT).do(run_homes, homes, workers, pool)
+    print(f"Watching downloads/ of {', '.join(homes)} every {PIPELINE_POLL_SECONDS}s")
+    while True:
+        schedule.run_pending()
+        time.sleep(1)
+
+def main(argv=None, home=None):
+    parser = argparse.ArgumentParser(description="Run the daily scripts")
+    parser.add_argument("--home", action="append", choices=sorted(PROFILES), help="home folder to run (repeatable; default: all homes, or this folder's home)")
+    parser.add_argument("--daemon", action="store_true", help="keep running and process new files in downloads/ as they arrive")
+    parser.add_argument("--workers", type=int, default=PIPELINE_HOME_WORKERS, help="homes to run at the same time")
+    args = parser.parse_args(argv)
+    homes = args.home or ([home] if home else list(PROFILES))
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.daemon:
+        run_daemon(homes, args.workers)
+    else:
+        # Directly run the scraping bot when the script is executed
+        run_homes(homes, args.workers)
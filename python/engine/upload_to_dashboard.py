@@ -0,0 +1,299 @@
+import argparse
+import csv
+import json
+import firebase_admin
+from firebase_admin import credentials, db
+import re  
+import os  
+import time
+from .homes_db import homes_dict
+from dotenv import load_dotenv
+from .manifest import Manifest, add_manifest_arguments
+from .profiles import PYTHON_DIR, HomeProfile, get_profile
+
+# Load environment variables
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '../../.env'))
+
+def initialize_firebase():
+    """Initialize the default Firebase app from the .env variables (once per process)."""
+    try:
+        firebase_admin.get_app()
+        return
+    except ValueError:
+        pass
+
+    # Check if required environment variables are set
+    required_vars = [
+        'FIREBASE_TYPE',
+        'FIREBASE_PROJECT_ID',
+        'FIREBASE_PRIVATE_KEY_ID',
+        'FIREBASE_PRIVATE_KEY',
+        'FIREBASE_CLIENT_EMAIL',
+        'FIREBASE_CLIENT_ID',
+        'FIREBASE_AUTH_URI',
+        'FIREBASE_TOKEN_URI',
+        'FIREBASE_AUTH_PROVIDER_X509_CERT_URL',
+        'FIREBASE_CLIENT_X509_CERT_URL',
+        'FIREBASE_UNIVERSE_DOMAIN',
+        'FIREBASE_DATABASE_URL'
+    ]
+
+    missing_vars = [var for var in required_vars if not os.getenv(var)]
+    if missing_vars:
+        print("Error: Missing required environment variables:")
+        for var in missing_vars:
+            print(f"- {var}")
+        print("\nPlease create a .env file with these variables. You can copy them from your Firebase service account JSON file.")
+        exit(1)
+
+    # Initialize Firebase Admin SDK with environment variables
+    try:
+        cred = credentials.Certificate({
+            "type": os.getenv('FIREBASE_TYPE'),
+            "project_id": os.getenv('FIREBASE_PROJECT_ID'),
+            "private_key_id": os.getenv('FIREBASE_PRIVATE_KEY_ID'),
+            "private_key": os.getenv('FIREBASE_PRIVATE_KEY').replace('\\n', '\n'),
+            "client_email": os.getenv('FIREBASE_CLIENT_EMAIL'),
+            "client_id": os.getenv('FIREBASE_CLIENT_ID'),
+            "auth_uri": os.getenv('FIREBASE_AUTH_URI'),
+            "token_uri": os.getenv('FIREBASE_TOKEN_URI'),
+            "auth_provider_x509_cert_url": os.getenv('FIREBASE_AUTH_PROVIDER_X509_CERT_URL'),
+            "client_x509_cert_url": os.getenv('FIREBASE_CLIENT_X509_CERT_URL'),
+            "universe_domain": os.getenv('FIREBASE_UNIVERSE_DOMAIN')
+        })
+
+        firebase_admin.initialize_app(cred, {
+            'databaseURL': os.getenv('FIREBASE_DATABASE_URL')
+        })
+    except Exception as e:
+        print(f"Error initializing Firebase: {str(e)}")
+        print("\nPlease check your .env file and make sure all variables are set correctly.")
+        exit(1)
+
+#Function: uploading merged.csv to dashboard in order to display the data on the dashboard
+#Input: merged.csv
+
+# "diff" only sends rows that changed, "bulk" rewrites a month node with a few multi-path updates,
+# "rows" keeps the old delete and one set() per row
+FIREBASE_UPLOAD_MODE = os.getenv('FIREBASE_UPLOAD_MODE', 'diff')
+# rows per update() call, and how many times a failed chunk is retried
+FIREBASE_UPLOAD_CHUNK_SIZE = int(os.getenv('FIREBASE_UPLOAD_CHUNK_SIZE', '500'))
+FIREBASE_UPLOAD_MAX_RETRIES = int(os.getenv('FIREBASE_UPLOAD_MAX_RETRIES', '3'))
+# what diff mode last pushed to each month node, so unchanged months need no remote read
+SNAPSHOT_DIR = os.getenv('FIREBASE_SNAPSHOT_DIR', os.path.join(PYTHON_DIR, 'cache', 'dashboard_snapshots'))
+
+def write_with_retry(write, payload, description):
+    """Call write(payload), retrying with exponential backoff. Returns True on success."""
+    for attempt in range(FIREBASE_UPLOAD_MAX_RETRIES + 1):
+        try:
+            write(payload)
+            return True
+        except (firebase_admin.exceptions.UnauthenticatedError, firebase_admin.exceptions.PermissionDeniedError) as e:
+            print(f'Authentication error: {e}')
+            return False
+        except Exception as e:
+            if attempt == FIREBASE_UPLOAD_MAX_RETRIES:
+                print(f'Error uploading {description}: {e}')
+                return False
+            delay = 2 ** attempt
+            print(f'Error uploading {description} ({e}), retrying in {delay}s')
+            time.sleep(delay)
+
+def upload_rows_in_chunks(ref, ref_path, rows):
+    """
+    Write rows under ref as {"0": row, "1": row, ...} in chunks of
+    FIREBASE_UPLOAD_CHUNK_SIZE. The first chunk is a set() that replaces the
+    whole node (dropping rows left over from a longer previous upload), the rest
+    are multi-path update() calls. A failed chunk is retried on its own.
+    """
+    if not rows:
+        return write_with_retry(lambda _: ref.delete(), None, f'empty month to {ref_path}')
+
+    chunk_size = max(1, FIREBASE_UPLOAD_CHUNK_SIZE)
+    for start in range(0, len(rows), chunk_size):
+        end = min(start + chunk_size, len(rows))
+        chunk = {str(index): rows[index] for index in range(start, end)}
+        write = ref.set if start == 0 else ref.update
+        if not write_with_retry(write, chunk, f'rows {start}-{end - 1} to {ref_path}'):
+            return False
+        print(f'Uploaded rows {start}-{end - 1} to {ref_path}')
+    return True
+
+def snapshot_path(ref_path):
+    return os.path.join(SNAPSHOT_DIR, ref_path.replace('/', '__') + '.json')
+
+def load_snapshot(ref_path):
+    """{"rows": {...}} last pushed to ref_path, or None."""
+    try:
+        with open(snapshot_path(ref_path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_snapshot(ref_path, rows):
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    tmp_path = snapshot_path(ref_path) + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'rows': rows}, f)
+    os.replace(tmp_path, snapshot_path(ref_path))
+
+def discard_snapshot(ref_path):
+    """Forget the snapshot when the node is written some other way, so diff mode reads it again."""
+    if os.path.exists(snapshot_path(ref_path)):
+        os.remove(snapshot_path(ref_path))
+
+def rows_from_node(value):
+    """Firebase returns a node of "0", "1", ... children as a list (with None gaps) or as a dict."""
+    if not value:
+        return {}
+    if isinstance(value, list):
+        return {str(index): row for index, row in enumerate(value) if row is not None}
+    return {str(key): row for key, row in value.items()}
+
+def diff_rows(current, new):
+    """Multi-path update that turns current into new: changed and added rows, None for deleted ones."""
+    delta = {key: row for key, row in new.items() if current.get(key) != row}
+    delta.update({key: None for key in current if key not in new})
+    return delta
+
+def sync_rows(ref, ref_path, rows):
+    """
+    Bring the month node in line with rows by sending only what changed.
+
+    The remote read is skipped only when the local rows are unchanged, i.e.
+    exactly what the last push sent according to the local snapshot. Otherwise
+    the node is read once and diffed, since the dashboard may have edited it
+    since (an ETag from after our own write would cost the same full read).
+    """
+    new = {str(index): row for index, row in enumerate(rows)}
+    snapshot = load_snapshot(ref_path)
+    if snapshot is not None and snapshot['rows'] == new:
+        print(f'No changes for {ref_path} since the last upload')
+        return True
+
+    try:
+        current = rows_from_node(ref.get())
+    except firebase_admin.exceptions.UnauthenticatedError as e:
+        print(f'Authentication error: {e}')
+        return False
+    except Exception as e:
+        print(f'Error reading {ref_path}: {e}')
+        return False
+
+    delta = diff_rows(current, new)
+    if not delta:
+        print(f'{ref_path} is already up to date')
+        save_snapshot(ref_path, new)
+        return True
+
+    keys = list(delta)
+    chunk_size = max(1, FIREBASE_UPLOAD_CHUNK_SIZE)
+    for start in range(0, len(keys), chunk_size):
+        chunk = {key: delta[key] for key in keys[start:start + chunk_size]}
+        if not write_with_retry(ref.update, chunk, f'{len(chunk)} changed rows to {ref_path}'):
+            return False
+    print(f'Synced {ref_path}: {sum(row is not None for row in delta.values())} rows written, {sum(row is None for row in delta.values())} removed')
+    save_snapshot(ref_path, new)
+    return True
+
+def read_csv_rows(csv_file_path):
+    with open(csv_file_path, mode='r', encoding='utf-8') as csv_file:
+        return list(csv.DictReader(csv_file))
+
+# Function to upload CSV data to Firebase
+def upload_csv_to_firebase(csv_file_path, dashboard, year, month):
+    # Construct the database reference path
+    ref_path = f'{dashboard}/{year}/{month}'
+    # explicit url so this still targets FIREBASE_DATABASE_URL when update.py initialized the app in the same process
+    ref = db.reference(ref_path, url=os.getenv('FIREBASE_DATABASE_URL'))
+
+    if FIREBASE_UPLOAD_MODE == 'diff':
+        return sync_rows(ref, ref_path, read_csv_rows(csv_file_path))
+    # a month written any other way makes the diff snapshot stale
+    discard_snapshot(ref_path)
+    if FIREBASE_UPLOAD_MODE == 'bulk':
+        return upload_rows_in_chunks(ref, ref_path, read_csv_rows(csv_file_path))
+
+    try:
+        # Remove existing data at the reference
+        ref.delete()
+        print(f'Removed existing data at {ref_path}')
+    except firebase_admin.exceptions.UnauthenticatedError as e:
+        print(f'Authentication error: {e}')
+        return False
+    except Exception as e:
+        print(f'Error deleting data: {e}')
+        return False
+
+    # Read and upload CSV data
+    with open(csv_file_path, mode='r', encoding='utf-8') as csv_file:
+        csv_reader = csv.DictReader(csv_file)
+        for index, row in enumerate(csv_reader):
+            ref.child(str(index)).set(row)
+            print(f'Uploaded row {index} to {ref_path}/{index}')
+    return True
+
+def extract_info_from_filename(filename):
+    match = re.search(r'(?P<dashboard>[\w_]+)_(?P<month>\d{2})-(?P<day>\d{2})-(?P<year>\d{4})', filename)
+    if match:
+        dashboard = homes_dict.get(match.group('dashboard'), 'unknown')  
+        year = match.group('year')
+        month = match.group('month')
+        return dashboard, year, month
+    return None, None, None
+
+def upload_target(filename, upload_targets):
+    """Dashboard node for a CSV from its suffix (see HomeProfile.upload_targets), or None if it is not uploaded."""
+    return next((node for suffix, node in upload_targets if filename.endswith(suffix)), None)
+
+def process_csv_files(base_directory, profile: HomeProfile, manifest: Manifest = None):
+    # files that have not changed since their last successful upload are skipped
+    manifest = manifest or Manifest(base_directory)
+    # Dictionary to store files by dashboard and date
+    files_by_dashboard = {}
+
+    for root, dirs, files in os.walk(base_directory):
+        for file in files:
+            if upload_target(file, profile.upload_targets) is not None:
+                filename = os.path.join(root, file)
+                dashboard, year, month = extract_info_from_filename(filename)
+
+                if dashboard and year and month:
+                    # Create a key for the dashboard
+                    if dashboard not in files_by_dashboard:
+                        files_by_dashboard[dashboard] = []
+                    
+                    # Add the file to the list for this dashboard
+                    files_by_dashboard[dashboard].append((filename, year, month))
+
+    # Process all files for each dashboard
+    for dashboard, files in files_by_dashboard.items():
+        print(f'\nProcessing Dashboard: {dashboard}')
+        for filename, year, month in files:
+            if manifest.is_current("upload", [filename]):
+                print(f'\nUnchanged since last upload, skipping: {filename}')
+                continue
+            print(f'\nUploading file: {filename}')
+            print(f'Year: {year}, Month: {month}')
+            
+            
+            if dashboard != 'unknown':
+                node = upload_target(filename, profile.upload_targets)
+                ref_path = f'{dashboard}/{node}' if node else dashboard
+                if node:
+                    print(f"Uploading to {node}")
+                if upload_csv_to_firebase(filename, ref_path, year, month):
+                    manifest.record("upload", [filename])
+                    print(f"Successfully uploaded to firebase at {ref_path}/{year}/{month}")
+                
+            else:
+                print(f"Skipping unknown dashboard for file: {filename}")
+
+def main(profile, argv=None, home_dir=None):
+    profile = get_profile(profile)
+    parser = argparse.ArgumentParser(description="Upload merged (and follow-up) CSV files to the dashboards")
+    add_manifest_arguments(parser)
+    args = parser.parse_args(argv)
+    initialize_firebase()
+    base_directory = os.path.join(home_dir or profile.directory, 'analyzed')
+    process_csv_files(base_directory, profile, Manifest.from_args(base_directory, args))
@@ -0,0 +1,440 @@
+#local job service for the admin upload route: runs a home's scripts on warm worker processes instead of fresh python3 calls per request
+import argparse
+import hmac
+import importlib
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from dotenv import load_dotenv
+
+from engine import STAGE_NAMES, get_profile
+
+PYTHON_DIR = os.path.dirname(os.path.abspath(__file__))
+load_dotenv(dotenv_path=os.path.join(PYTHON_DIR, '../.env'))
+
+PIPELINE_SERVICE_HOST = os.getenv("PIPELINE_SERVICE_HOST", "127.0.0.1")
+PIPELINE_SERVICE_PORT = int(os.getenv("PIPELINE_SERVICE_PORT", "8765"))
+PIPELINE_SERVICE_WORKERS = int(os.getenv("PIPELINE_SERVICE_WORKERS", "2"))
+# job queue database and per-job workspaces (downloads/ plus a link to the home's analyzed/)
+PIPELINE_JOBS_DIR = os.getenv("PIPELINE_JOBS_DIR", os.path.join(PYTHON_DIR, "cache", "jobs"))
+# a job still running when the service stopped is resumed until it has been started this many times
+PIPELINE_JOB_MAX_ATTEMPTS = int(os.getenv("PIPELINE_JOB_MAX_ATTEMPTS", "3"))
+# the upload route saves files here; a job only takes files from under this folder
+PIPELINE_UPLOAD_DIR = os.getenv("PIPELINE_UPLOAD_DIR", os.path.join(PYTHON_DIR, "cache", "uploads"))
+# shared with the upload route, sent as "Authorization: Bearer <token>"; every request but /health needs it
+PIPELINE_SERVICE_TOKEN = os.getenv("PIPELINE_SERVICE_TOKEN", "")
+
+# heavy imports every job needs; loaded once per worker process (engine.run_script imports every stage)
+PRELOAD_MODULES = ("pandas", "openai", "pdfplumber", "firebase_admin", "xlrd", "engine.run_script")
+
+FINISHED = ("succeeded", "failed")
+
+def home_directory(home: str) -> str:
+    """python/<home> for a known home (engine/profiles.py); raises ValueError otherwise."""
+    return get_profile(home).directory
+
+def uploaded_files(files, upload_dir: str = PIPELINE_UPLOAD_DIR) -> list:
+    """
+    The real paths of the uploaded files; raises ValueError unless every one is
+    a regular file (not a link) under upload_dir with a distinct name.
+    """
+    if not isinstance(files, list) or not files:
+        raise ValueError("No files to process")
+    root = os.path.realpath(upload_dir)
+    paths = []
+    for path in files:
+        real = os.path.realpath(path) if isinstance(path, str) else ""
+        if (not os.path.isabs(str(path)) or os.path.islink(path) or not os.path.isfile(real)
+                or os.path.commonpath([root, real]) != root or real == root):
+            raise ValueError(f"Not an uploaded file: {path}")
+        paths.append(real)
+    names = [os.path.basename(path) for path in paths]
+    if len(set(names)) != len(names):
+        raise ValueError("Uploaded files must have distinct names")
+    return paths
+
+class JobStore:
+    """
+    SQLite job queue shared by the server and its worker processes (each opens
+    its own connection). Jobs and their stages are saved as they change, so a
+    restarted service knows which jobs were in flight and which of their
+    stages had already finished.
+    """
+
+    def __init__(self, jobs_dir: str = PIPELINE_JOBS_DIR):
+        os.makedirs(jobs_dir, exist_ok=True)
+        self.jobs_dir = jobs_dir
+        self.conn = sqlite3.connect(os.path.join(jobs_dir, "jobs.sqlite"), timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+        self.conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                home TEXT NOT NULL,
+                files TEXT NOT NULL,
+                status TEXT NOT NULL,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS stages (
+                job_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                status TEXT NOT NULL,
+                error TEXT,
+                started_at REAL,
+                finished_at REAL,
+                seconds REAL,
+                PRIMARY KEY (job_id, name)
+            );
+            CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status, created_at);
+        """)
+
+    def workspace(self, job_id: str) -> str:
+        return os.path.join(self.jobs_dir, job_id)
+
+    def execute(self, sql: str, params=()):
+        with self.lock:
+            self.conn.execute(sql, params)
+            self.conn.commit()
+
+    def create(self, home: str, files: list) -> str:
+        """
+        Move the uploaded files into a new job workspace and queue the job. If
+        anything fails the files are moved back and the workspace removed, so
+        the caller still has its upload.
+        """
+        home_dir = home_directory(home)
+        files = uploaded_files(files)
+        job_id = uuid.uuid4().hex
+        workspace = self.workspace(job_id)
+        moved = []
+        try:
+            os.makedirs(os.path.join(workspace, "downloads"))
+            os.makedirs(os.path.join(home_dir, "analyzed"), exist_ok=True)
+            # outputs still land in the home's analyzed/ (jobs for one home never run at the same time)
+            os.symlink(os.path.join(home_dir, "analyzed"), os.path.join(workspace, "analyzed"))
+            for path in files:
+                target = os.path.join(workspace, "downloads", os.path.basename(path))
+                shutil.move(path, target)
+                moved.append((path, target))
+
+            with self.lock:
+                try:
+                    self.conn.execute(
+                        "INSERT INTO jobs (id, home, files, status, created_at) VALUES (?, ?, ?, 'queued', ?)",
+                        (job_id, home, json.dumps([os.path.basename(path) for path in files]), time.time())
+                    )
+                    self.conn.executemany(
+                        "INSERT INTO stages (job_id, position, name, status) VALUES (?, ?, ?, 'pending')",
+                        [(job_id, position, name) for position, name in enumerate(STAGE_NAMES)]
+                    )
+                    self.conn.commit()
+                except BaseException:
+                    self.conn.rollback()
+                    raise
+        except BaseException:
+            for path, target in reversed(moved):
+                try:
+                    shutil.move(target, path)
+                except OSError as e:
+                    logging.error(f"Could not move {target} back to {path}: {e}")
+            # rmtree removes the analyzed link itself, not the home's folder behind it
+            shutil.rmtree(workspace, ignore_errors=True)
+            raise
+        return job_id
+
+    def get(self, job_id: str):
+        """Job as the API returns it, or None."""
+        with self.lock:
+            job = self.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            stages = self.conn.execute("SELECT * FROM stages WHERE job_id = ? ORDER BY position", (job_id,)).fetchall()
+        if job is None:
+            return None
+        return {
+            "id": job["id"],
+            "home": job["home"],
+            "files": json.loads(job["files"]),
+            "status": job["status"],
+            "error": job["error"],
+            "attempts": job["attempts"],
+            "createdAt": job["created_at"],
+            "startedAt": job["started_at"],
+            "finishedAt": job["finished_at"],
+            "stages": [{
+                "name": stage["name"],
+                "status": stage["status"],
+                "startedAt": stage["started_at"],
+                "finishedAt": stage["finished_at"],
+                "seconds": stage["seconds"],
+                "error": stage["error"],
+            } for stage in stages],
+        }
+
+    def next_runnable(self, busy_homes: set):
+        """Oldest queued job whose home has nothing running, marked running; None if there is none."""
+        with self.lock:
+            for row in self.conn.execute("SELECT id, home FROM jobs WHERE status = 'queued' ORDER BY created_at").fetchall():
+                if row["home"] not in busy_homes:
+                    self.conn.execute(
+                        "UPDATE jobs SET status = 'running', attempts = attempts + 1, started_at = COALESCE(started_at, ?) WHERE id = ?",
+                        (time.time(), row["id"])
+                    )
+                    self.conn.commit()
+                    return row["id"], row["home"]
+        return None
+
+    def start_stage(self, job_id: str, name: str):
+        self.execute("UPDATE stages SET status = 'running', started_at = ?, finished_at = NULL, seconds = NULL, error = NULL WHERE job_id = ? AND name = ?",
+                     (time.time(), job_id, name))
+
+    def finish_stage(self, job_id: str, name: str, status: str, seconds: float, error: str = None):
+        self.execute("UPDATE stages SET status = ?, finished_at = ?, seconds = ?, error = ? WHERE job_id = ? AND name = ?",
+                     (status, time.time(), round(seconds, 2), error, job_id, name))
+
+    def finish(self, job_id: str, status: str, error: str = None):
+        self.execute("UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ? AND status = 'running'",
+                     (status, error, time.time(), job_id))
+        if status == "succeeded":
+            # failed workspaces are kept so their inputs can be looked at or resubmitted
+            shutil.rmtree(self.workspace(job_id), ignore_errors=True)
+
+    def completed_stages(self, job_id: str) -> set:
+        with self.lock:
+            rows = self.conn.execute("SELECT name FROM stages WHERE job_id = ? AND status = 'succeeded'", (job_id,)).fetchall()
+        return {row["name"] for row in rows}
+
+    def recover(self, max_attempts: int = PIPELINE_JOB_MAX_ATTEMPTS):
+        """
+        Requeue jobs that were running when the service stopped. Their finished
+        stages are kept, so they pick up at the stage that was interrupted.
+        """
+        with self.lock:
+            interrupted = self.conn.execute("SELECT id, attempts FROM jobs WHERE status = 'running'").fetchall()
+            for job in interrupted:
+                self.conn.execute("UPDATE stages SET status = 'pending', started_at = NULL WHERE job_id = ? AND status = 'running'", (job["id"],))
+                if job["attempts"] >= max_attempts:
+                    self.conn.execute("UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+                                      (f"Interrupted {job['attempts']} times", time.time(), job["id"]))
+                else:
+                    self.conn.execute("UPDATE jobs SET status = 'queued' WHERE id = ?", (job["id"],))
+            self.conn.commit()
+        if interrupted:
+            logging.info(f"Recovered {len(interrupted)} interrupted jobs")
+
+# ---- worker processes ----
+
+_store = None
+
+def _init_worker(jobs_dir: str):
+    global _store
+    _store = JobStore(jobs_dir)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            logging.warning(f"Could not preload {name}: {e}")
+
+def run_job(job_id: str, home: str) -> None:
+    """Run the job's unfinished stages in its workspace, recording progress in the job store."""
+    try:
+        profile = get_profile(home)
+        stages = [(name, importlib.import_module(f"engine.{name}")) for name in STAGE_NAMES]
+    except Exception as e:
+        logging.error(traceback.format_exc())
+        return _store.finish(job_id, "failed", f"Could not load scripts for {home}: {e}")
+
+    # the stages read downloads/ and write analyzed/ under the workspace instead of the home folder
+    workspace = _store.workspace(job_id)
+    completed = _store.completed_stages(job_id)
+    for name, module in stages:
+        if name in completed:
+            continue
+        _store.start_stage(job_id, name)
+        start = time.time()
+        try:
+            module.main(profile, [], home_dir=workspace)
+        except (Exception, SystemExit) as e:
+            error = str(e) or type(e).__name__
+            logging.error(traceback.format_exc())
+            _store.finish_stage(job_id, name, "failed", time.time() - start, error)
+            return _store.finish(job_id, "failed", f"{name} failed: {error}")
+        _store.finish_stage(job_id, name, "succeeded", time.time() - start)
+    _store.finish(job_id, "succeeded")
+
+# ---- scheduling in the server process ----
+
+class JobManager:
+    """
+    Runs queued jobs on a process pool: one job at a time per home (the
+    scripts share the home's analyzed/ folder and dashboard nodes), different
+    homes in parallel.
+    """
+
+    def __init__(self, store: JobStore, workers: int = PIPELINE_SERVICE_WORKERS):
+        self.store = store
+        self.workers = workers
+        self.running = {}  # home -> job id
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.pool = self._new_pool()
+        store.recover()
+        self.wakeup.set()
+        threading.Thread(target=self._dispatch_loop, name="job-dispatch", daemon=True).start()
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=_init_worker, initargs=(self.store.jobs_dir,))
+
+    def submit(self, home: str, files: list) -> dict:
+        job_id = self.store.create(home, files)
+        self.wakeup.set()
+        return self.store.get(job_id)
+
+    def _dispatch_loop(self):
+        while True:
+            self.wakeup.wait(timeout=5)
+            self.wakeup.clear()
+            with self.lock:
+                while len(self.running) < self.workers:
+                    job = self.store.next_runnable(set(self.running))
+                    if job is None:
+                        break
+                    job_id, home = job
+                    self.running[home] = job_id
+                    pool = self.pool
+                    future = pool.submit(run_job, job_id, home)
+                    future.add_done_callback(lambda f, job_id=job_id, home=home, pool=pool: self._done(job_id, home, pool, f))
+
+    def _done(self, job_id: str, home: str, pool, future):
+        error = future.exception()
+        if error is not None:
+            # run_job records its own failures; this is a worker process that died mid-job
+            logging.error(f"Worker running job {job_id} died: {error}")
+            self.store.finish(job_id, "failed", f"Worker crashed: {error}")
+            with self.lock:
+                if isinstance(error, BrokenProcessPool) and pool is self.pool:
+                    self.pool = self._new_pool()
+        with self.lock:
+            self.running.pop(home, None)
+        self.wakeup.set()
+
+    def wait_for_change(self, job_id: str, last: dict, timeout: float = 15, interval: float = 0.5):
+        """Poll the store until the job differs from last (or timeout); returns the current job."""
+        deadline = time.time() + timeout
+        job = self.store.get(job_id)
+        while job == last and time.time() < deadline:
+            time.sleep(interval)
+            job = self.store.get(job_id)
+        return job
+
+# ---- HTTP ----
+
+class PipelineRequestHandler(BaseHTTPRequestHandler):
+    """
+    POST /jobs                {"home": "oneill", "files": ["/abs/path.pdf", ...]} -> 202 job
+    GET  /jobs/<id>           job with per-stage status and timings
+    GET  /jobs/<id>/events    the same job as server-sent events until it finishes
+    GET  /health              no token needed, for the deployment healthcheck
+
+    Everything but /health needs "Authorization: Bearer <PIPELINE_SERVICE_TOKEN>".
+    """
+
+    manager: JobManager = None
+
+    def _send_json(self, status: int, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _authorized(self) -> bool:
+        header = self.headers.get("Authorization") or ""
+        if PIPELINE_SERVICE_TOKEN and hmac.compare_digest(header.encode(), f"Bearer {PIPELINE_SERVICE_TOKEN}".encode()):
+            return True
+        self._send_json(401, {"error": "Unauthorized"})
+        return False
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        if self.path.rstrip("/") != "/jobs":
+            return self._send_json(404, {"error": "Not found"})
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            job = self.manager.submit(body.get("home"), body.get("files") or [])
+        except (ValueError, OSError) as e:
+            return self._send_json(400, {"error": str(e)})
+        self._send_json(202, job)
+
+    def do_GET(self):
+        parts = [part for part in self.path.split("?")[0].split("/") if part]
+        if parts == ["health"]:
+            return self._send_json(200, {"status": "ok"})
+        if not self._authorized():
+            return
+        if len(parts) < 2 or parts[0] != "jobs":
+            return self._send_json(404, {"error": "Not found"})
+        job = self.manager.store.get(parts[1])
+        if job is None:
+            return self._send_json(404, {"error": "Job not found"})
+        if len(parts) == 2:
+            return self._send_json(200, job)
+        if parts[2:] == ["events"]:
+            return self._stream_events(job)
+        self._send_json(404, {"error": "Not found"})
+
+    def _stream_events(self, job: dict):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        try:
+            while True:
+                self.wfile.write(f"data: {json.dumps(job)}\n\n".encode())
+                self.wfile.flush()
+                if job["status"] in FINISHED:
+                    return
+                job = self.manager.wait_for_change(job["id"], job)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        logging.info("%s - %s", self.address_string(), format % args)
+
+def main():
+    parser = argparse.ArgumentParser(description="Local job service for processing uploaded behaviour files")
+    parser.add_argument("--host", default=PIPELINE_SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=PIPELINE_SERVICE_PORT)
+    parser.add_argument("--workers", type=int, default=PIPELINE_SERVICE_WORKERS)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if not PIPELINE_SERVICE_TOKEN:
+        parser.error("PIPELINE_SERVICE_TOKEN is not set; the upload route and the service need the same token")
+    os.makedirs(PIPELINE_UPLOAD_DIR, exist_ok=True)
+
+    PipelineRequestHandler.manager = JobManager(JobStore(), args.workers)
+    server = ThreadingHTTPServer((args.host, args.port), PipelineRequestHandler)
+    logging.info(f"Pipeline service listening on http://{args.host}:{args.port} with {args.workers} workers")
+    server.serve_forever()
+
+if __name__ == "__main__":
+    main()
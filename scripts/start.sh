@@ -0,0 +1,22 @@
+#!/usr/bin/env bash
+# production entry point: python/pipeline_service.py next to `next start`, since the upload route
+# queues its jobs there; when either one exits the other is stopped so the platform restarts both
+set -uo pipefail
+cd "$(dirname "$0")/.."
+
+# the upload route and the service must send/expect the same token; make one up when none is configured
+if [ -z "${PIPELINE_SERVICE_TOKEN:-}" ]; then
+  PIPELINE_SERVICE_TOKEN="$(od -An -N32 -tx1 /dev/urandom | tr -d ' \n')"
+  export PIPELINE_SERVICE_TOKEN
+fi
+
+"${PYTHON_PATH:-python3}" python/pipeline_service.py &
+service_pid=$!
+npm run start &
+next_pid=$!
+trap 'kill "$service_pid" "$next_pid" 2>/dev/null' EXIT INT TERM
+
+wait -n "$service_pid" "$next_pid"
+status=$?
+echo "start.sh: $( kill -0 "$service_pid" 2>/dev/null && echo "next" || echo "pipeline service" ) exited with status $status, stopping" >&2
+exit $(( status == 0 ? 1 : status ))
@@ -0,0 +1,29 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { PIPELINE_SERVICE_URL, pipelineServiceHeaders } from '@/lib/pipeline-service';
+
+export async function GET(
+  request: NextRequest,
+  { params }: { params: Promise<{ jobId: string }> }
+) {
+  try {
+    const { jobId } = await params;
+    const response = await fetch(`${PIPELINE_SERVICE_URL}/jobs/${encodeURIComponent(jobId)}`, {
+      cache: 'no-store',
+      headers: pipelineServiceHeaders(),
+    });
+    const job = await response.json();
+
+    if (!response.ok) {
+      return NextResponse.json({ error: job.error || 'Job not found' }, { status: response.status });
+    }
+
+    return NextResponse.json({ success: true, job });
+
+  } catch (error: unknown) {
+    console.error('Error fetching processing job:', error);
+    return NextResponse.json(
+      { error: 'Failed to fetch processing job', details: error instanceof Error ? error.message : 'Unknown error' },
+      { status: 500 }
+    );
+  }
+}
@@ -1,13 +1,11 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { writeFile, mkdir } from 'fs/promises';
-import { join } from 'path';
-import { exec } from 'child_process';
-import { promisify } from 'util';
-
-const execAsync = promisify(exec);
+import { writeFile, mkdtemp, mkdir, rm } from 'fs/promises';
+import { basename, join } from 'path';
+import { PIPELINE_SERVICE_URL, PIPELINE_UPLOAD_DIR, pipelineServiceHeaders } from '@/lib/pipeline-service';
 
 export async function POST(request: NextRequest) {
   console.log('🚀 [API] Starting behaviour files processing...');
+  let uploadDir: string | null = null;
   
   try {
     const formData = await request.formData();
@@ -40,112 +38,58 @@ export async function POST(request: NextRequest) {
       }
     }
 
-    const homeDir = join(process.cwd(), 'python', home);
-    const downloadsDir = join(homeDir, 'downloads');
-
-    console.log(`🏠 [API] Creating directories for home: ${home}`);
-    await mkdir(downloadsDir, { recursive: true });
+    // the pipeline service moves these into the job's own workspace, so uploads never share python/<home>/downloads
+    console.log(`🏠 [API] Creating upload directory for home: ${home}`);
+    await mkdir(PIPELINE_UPLOAD_DIR, { recursive: true });
+    uploadDir = await mkdtemp(join(PIPELINE_UPLOAD_DIR, 'behaviour-upload-'));
     console.log('✅ [API] Directories created');
 
     console.log(`💾 [API] Saving ${pdfFiles.length} PDF files and ${excelFiles.length} Excel files`);
+    const savedPaths: string[] = [];
     
     for (const file of pdfFiles) {
       const bytes = new Uint8Array(await file.arrayBuffer());
-      const path = join(downloadsDir, file.name);
+      const path = join(uploadDir, basename(file.name));
       await writeFile(path, Buffer.from(bytes));
+      savedPaths.push(path);
       console.log(`✅ [API] Saved PDF: ${file.name}`);
     }
     
     for (const file of excelFiles) {
       const bytes = new Uint8Array(await file.arrayBuffer());
-      const path = join(downloadsDir, file.name);
+      const path = join(uploadDir, basename(file.name));
       await writeFile(path, Buffer.from(bytes));
+      savedPaths.push(path);
       console.log(`✅ [API] Saved Excel: ${file.name}`);
     }
 
     console.log('✅ [API] All files saved successfully');
 
-    console.log('🐍 [PYTHON] Installing required packages...');
-    try {
-      await execAsync(`python3 -m pip install --user --break-system-packages pdfplumber openai pandas python-dotenv openpyxl`);
-      console.log('✅ [PYTHON] Packages installed successfully');
-    } catch (pipErr) {
-      console.log('⚠️ [PYTHON] Package installation warning:', pipErr);
-    }
-
-    console.log('🐍 [PYTHON] Step 1: Processing Excel data...');
-    try {
-      const excelResult = await execAsync(`cd "${homeDir}" && python3 getExcelInfo.py`);
-      console.log('✅ [PYTHON] Excel processing completed');
-      console.log('📊 [PYTHON] Excel output:', excelResult.stdout);
-      if (excelResult.stderr) {
-        console.log('⚠️ [PYTHON] Excel warnings:', excelResult.stderr);
-      }
-    } catch (error) {
-      console.error('❌ [PYTHON] Excel processing failed:', error);
-      throw error;
-    }
-
-    console.log('🐍 [PYTHON] Step 2: Processing PDF data...');
-    try {
-      const pdfResult = await execAsync(`cd "${homeDir}" && python3 getPdfInfo.py`);
-      console.log('✅ [PYTHON] PDF processing completed');
-      console.log('📊 [PYTHON] PDF output:', pdfResult.stdout);
-      if (pdfResult.stderr) {
-        console.log('⚠️ [PYTHON] PDF warnings:', pdfResult.stderr);
-      }
-    } catch (error) {
-      console.error('❌ [PYTHON] PDF processing failed:', error);
-      throw error;
-    }
+    console.log(`🐍 [PYTHON] Queueing processing job for ${home}...`);
+    const serviceResponse = await fetch(`${PIPELINE_SERVICE_URL}/jobs`, {
+      method: 'POST',
+      headers: pipelineServiceHeaders({ 'Content-Type': 'application/json' }),
+      body: JSON.stringify({ home, files: savedPaths }),
+    });
+    const job = await serviceResponse.json();
 
-    console.log('🐍 [PYTHON] Step 3: Generating behaviour data...');
-    try {
-      const behaviourResult = await execAsync(`cd "${homeDir}" && python3 getBe.py`);
-      console.log('✅ [PYTHON] Behaviour data generation completed');
-      console.log('📊 [PYTHON] Behaviour output:', behaviourResult.stdout);
-      if (behaviourResult.stderr) {
-        console.log('⚠️ [PYTHON] Behaviour warnings:', behaviourResult.stderr);
-      }
-    } catch (error) {
-      console.error('❌ [PYTHON] Behaviour data generation failed:', error);
-      throw error;
-    }
-    console.log('🐍 [PYTHON] Step 4: Updating dashboard...');
-    try {
-      const dashboardResult = await execAsync(`cd "${homeDir}" && python3 update.py`);
-      console.log('✅ [PYTHON] Dashboard updated successfully');
-      console.log('📊 [PYTHON] Dashboard output:', dashboardResult.stdout);
-      if (dashboardResult.stderr) {
-        console.log('⚠️ [PYTHON] Dashboard warnings:', dashboardResult.stderr);
-      }
-    } catch (error) {
-      console.error('❌ [PYTHON] Dashboard update failed:', error);
-      throw error;
-    }
-    console.log('🐍 [PYTHON] Step 5: Uploading to dashboard...');
-    try {
-      const uploadResult = await execAsync(`cd "${homeDir}" && python3 upload_to_dashboard.py`);
-      console.log('✅ [PYTHON] Dashboard uploaded successfully');
-      console.log('📊 [PYTHON] Dashboard output:', uploadResult.stdout);
-      if (uploadResult.stderr) {
-        console.log('⚠️ [PYTHON] Dashboard warnings:', uploadResult.stderr);
-      }
-    } catch (error) {
-      console.error('❌ [PYTHON] Dashboard upload failed:', error);
-      throw error;
+    if (!serviceResponse.ok) {
+      console.error('❌ [PYTHON] Pipeline service rejected the job:', job);
+      return NextResponse.json({ error: 'Failed to queue processing job', details: job.error }, { status: serviceResponse.status });
     }
 
-    console.log('🎉 [API] File processing completed successfully!');
+    console.log(`✅ [API] Job ${job.id} queued`);
 
     return NextResponse.json({
       success: true,
-      message: 'Files processed successfully',
+      message: 'Files uploaded, processing started',
+      jobId: job.id,
+      job,
       fileCounts: {
         pdfs: pdfFiles.length,
         excels: excelFiles.length
       }
-    });
+    }, { status: 202 });
 
   } catch (error) {
     console.error('Error processing files:', error);
@@ -153,6 +97,11 @@ export async function POST(request: NextRequest) {
       { error: 'Failed to process files', details: error instanceof Error ? error.message : 'Unknown error' },
       { status: 500 }
     );
+  } finally {
+    // the service has moved the files into its job by now (or moved them back when it refused the job)
+    if (uploadDir) {
+      await rm(uploadDir, { recursive: true, force: true });
+    }
   }
 }
 
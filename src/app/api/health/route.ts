@@ -0,0 +1,24 @@
+import { NextResponse } from 'next/server';
+import { PIPELINE_SERVICE_URL } from '@/lib/pipeline-service';
+
+// deployment healthcheck: uploads only work while the pipeline service answers too
+export const dynamic = 'force-dynamic';
+
+export async function GET() {
+  try {
+    const response = await fetch(`${PIPELINE_SERVICE_URL}/health`, {
+      cache: 'no-store',
+      signal: AbortSignal.timeout(5000),
+    });
+    if (!response.ok) {
+      return NextResponse.json({ status: 'error', pipelineService: `HTTP ${response.status}` }, { status: 503 });
+    }
+    return NextResponse.json({ status: 'ok', pipelineService: 'ok' });
+
+  } catch (error: unknown) {
+    return NextResponse.json(
+      { status: 'error', pipelineService: error instanceof Error ? error.message : 'Unknown error' },
+      { status: 503 }
+    );
+  }
+}
@@ -1,6 +1,9 @@
 'use client';
 
 import { useState, useEffect } from 'react';
+import type { PipelineJob, PipelineStage } from '@/lib/pipeline-service';
+
+const JOB_POLL_INTERVAL_MS = 2000;
 
 export default function FileUpload() {
   const [pdfFiles, setPdfFiles] = useState<File[]>([]);
@@ -10,6 +13,7 @@ export default function FileUpload() {
   const [loading, setLoading] = useState(false);
   const [loadingHomes, setLoadingHomes] = useState(true);
   const [message, setMessage] = useState('');
+  const [jobStages, setJobStages] = useState<PipelineStage[]>([]);
 
   useEffect(() => {
     const fetchHomes = async () => {
@@ -58,10 +62,28 @@ export default function FileUpload() {
     }
   };
 
+  const waitForJob = async (jobId: string): Promise<PipelineJob> => {
+    while (true) {
+      await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+      const response = await fetch(`/api/admin/process-behaviours/${jobId}`);
+      const data = await response.json();
+
+      if (!response.ok) {
+        throw new Error(data.error || `Failed to fetch job: ${response.status}`);
+      }
+
+      setJobStages(data.job.stages);
+      if (data.job.status === 'succeeded' || data.job.status === 'failed') {
+        return data.job;
+      }
+    }
+  };
+
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
     setLoading(true);
     setMessage('');
+    setJobStages([]);
 
     if (pdfFiles.length === 0 || excelFiles.length === 0 || !selectedHome) {
       setMessage('Please select at least one PDF file, one Excel file, and a home');
@@ -91,7 +113,16 @@ export default function FileUpload() {
 
       const result = await response.json();
 
-      if (response.ok) {
+      if (!response.ok) {
+        setMessage(`Error: ${result.error}`);
+        return;
+      }
+
+      setMessage('Files uploaded, processing...');
+      setJobStages(result.job.stages);
+      const job = await waitForJob(result.jobId);
+
+      if (job.status === 'succeeded') {
         setMessage('Files processed successfully!');
         setPdfFiles([]);
         setExcelFiles([]);
@@ -101,7 +132,7 @@ export default function FileUpload() {
         if (pdfInput) pdfInput.value = '';
         if (excelInput) excelInput.value = '';
       } else {
-        setMessage(`Error: ${result.error}`);
+        setMessage(`Error: ${job.error}`);
       }
     } catch (error) {
       setMessage(`Error: ${error}`);
@@ -289,6 +320,17 @@ export default function FileUpload() {
             </button>
           </div>
 
+          {jobStages.length > 0 && (
+            <ul className="text-sm text-gray-600 space-y-1">
+              {jobStages.map((stage) => (
+                <li key={stage.name}>
+                  {stage.name}: {stage.status}
+                  {stage.seconds !== null ? ` (${stage.seconds.toFixed(1)}s)` : ''}
+                </li>
+              ))}
+            </ul>
+          )}
+
           {message && (
             <div className={`text-sm ${message.includes('Error') ? 'text-red-600' : ''}`} style={!message.includes('Error') ? { color: '#06b6d4' } : {}}>
               {message}
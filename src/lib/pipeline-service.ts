@@ -0,0 +1,36 @@
+// python/pipeline_service.py runs the behaviour scripts; API routes only queue jobs and read their progress
+import { join } from 'path';
+
+export const PIPELINE_SERVICE_URL = process.env.PIPELINE_SERVICE_URL || 'http://127.0.0.1:8765';
+// the service only takes files from under this folder, so both sides must use the same one
+export const PIPELINE_UPLOAD_DIR = process.env.PIPELINE_UPLOAD_DIR || join(process.cwd(), 'python', 'cache', 'uploads');
+
+// every service call but /health needs the shared PIPELINE_SERVICE_TOKEN
+export function pipelineServiceHeaders(headers: Record<string, string> = {}): Record<string, string> {
+  return { ...headers, Authorization: `Bearer ${process.env.PIPELINE_SERVICE_TOKEN || ''}` };
+}
+
+export type PipelineStageStatus = 'pending' | 'running' | 'succeeded' | 'failed';
+export type PipelineJobStatus = 'queued' | 'running' | 'succeeded' | 'failed';
+
+export interface PipelineStage {
+  name: string;
+  status: PipelineStageStatus;
+  startedAt: number | null;
+  finishedAt: number | null;
+  seconds: number | null;
+  error: string | null;
+}
+
+export interface PipelineJob {
+  id: string;
+  home: string;
+  files: string[];
+  status: PipelineJobStatus;
+  error: string | null;
+  attempts: number;
+  createdAt: number;
+  startedAt: number | null;
+  finishedAt: number | null;
+  stages: PipelineStage[];
+}